@@ -5,23 +5,58 @@
  * ve en avantajlı kartı bulur.
  */
 
+/**
+ * Metni karşılaştırma için kelimelere ayır: küçük harf, Türkçe karakterler
+ * ASCII'ye ("Şok" -> "sok", "Arçelik" -> "arcelik"), harf/rakam dışı her şey ayraç.
+ * Scraper'ın merchant_pattern anahtarları ("burgerking", "mcdonalds") bu biçimde.
+ *
+ * @param {string} text
+ * @returns {array} - Kelimeler (örn: "McDonald's" -> ["mcdonald", "s"])
+ */
+function foldTokens(text) {
+  return text
+    .toLowerCase()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/ı/g, 'i')
+    .split(/[^a-z0-9]+/)
+    .filter(Boolean);
+}
+
+/**
+ * Ardışık kelimelerden biri birleştirilince target'a eşit mi?
+ * ("burger", "king") -> "burgerking" eşleşir; "ahmet" içindeki "hm" eşleşmez.
+ */
+function hasTokenRun(tokens, target) {
+  for (let i = 0; i < tokens.length; i++) {
+    let joined = '';
+    for (let j = i; j < tokens.length && joined.length < target.length; j++) {
+      joined += tokens[j];
+      if (joined === target) return true;
+    }
+  }
+  return false;
+}
+
 /**
  * Fuzzy matching - Mağaza adı eşleştirmesi
- * MVP için basit toLowerCase().includes() kullanıyoruz
+ * Boşluk/noktalama ve Türkçe karakterlerden bağımsız, yalnızca tam kelime eşleşmesi:
+ * "Burger King" ve "burgerking", "Trendyol'dan" ve "trendyol" eşleşir,
+ * "Ahmet" ve "hm" (H&M) eşleşmez.
  *
- * @param {string} userInput - Kullanıcının girdiği mağaza adı (örn: "trendyol")
- * @param {string} pattern - Kampanyadaki merchant_pattern (örn: "trendyol")
+ * @param {string} userInput - Kullanıcının girdiği mağaza adı (örn: "Burger King")
+ * @param {string} pattern - Kampanyadaki merchant_pattern (örn: "burgerking")
  * @returns {boolean} - Eşleşme varsa true
  */
 function fuzzyMatch(userInput, pattern) {
   if (!userInput || !pattern) return false;
 
-  const normalizedInput = userInput.toLowerCase().trim();
-  const normalizedPattern = pattern.toLowerCase().trim();
+  const inputTokens = foldTokens(userInput);
+  const patternTokens = foldTokens(pattern);
+  if (inputTokens.length === 0 || patternTokens.length === 0) return false;
 
-  // Basit includes kontrolü - MVP için yeterli
-  return normalizedInput.includes(normalizedPattern) ||
-         normalizedPattern.includes(normalizedInput);
+  return hasTokenRun(inputTokens, patternTokens.join('')) ||
+         hasTokenRun(patternTokens, inputTokens.join(''));
 }
 
 /**
@@ -72,8 +107,9 @@ function compareCards(campaigns, merchant, amount) {
   const cardResults = {};
 
   for (const campaign of campaigns) {
-    // Fuzzy matching - mağaza eşleşmesi
-    if (!fuzzyMatch(merchant, campaign.merchant_pattern)) {
+    // Fuzzy matching - mağaza eşleşmesi (anahtar veya mağaza adı; "THY" / "Türk Hava Yolları")
+    if (!fuzzyMatch(merchant, campaign.merchant_pattern) &&
+        !fuzzyMatch(merchant, campaign.merchant_name)) {
       continue;
     }
 
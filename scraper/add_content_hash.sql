@@ -0,0 +1,16 @@
+-- Diff-based writes: the scraper only rewrites campaigns whose content changed
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/lmygwmivhbswqnuvsuht/sql
+
+-- Hash of the normalized fields (supabase_client.content_hash)
+ALTER TABLE campaigns
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Last run that saw the campaign on the bank's site, changed or not
+ALTER TABLE campaigns
+ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ DEFAULT NOW();
+
+-- Verify columns were added
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'campaigns'
+AND column_name IN ('content_hash', 'last_seen_at');
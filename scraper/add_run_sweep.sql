@@ -0,0 +1,15 @@
+-- Mark-and-sweep deactivation: each scrape run tags the campaigns it saw
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/lmygwmivhbswqnuvsuht/sql
+
+-- Last scrape run (main.py RUN_ID) that saw the campaign
+ALTER TABLE campaigns
+ADD COLUMN IF NOT EXISTS last_run_id TEXT;
+
+-- The sweep filters a bank's active campaigns by card
+CREATE INDEX IF NOT EXISTS idx_campaigns_card_active ON campaigns(card_id, is_active);
+
+-- Verify column was added
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'campaigns'
+AND column_name = 'last_run_id';
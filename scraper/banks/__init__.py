@@ -1,16 +1,50 @@
 """
 Bank scraper modules.
+
+Banks are described entirely by their BANK_CONFIG entry; scraper_for()
+returns the named class below, or a generic ConfiguredScraper for a bank
+that only exists in config.
 """
+from typing import Type
+from base_scraper import BaseScraper
+from config import BANK_CONFIG
 from .akbank import AkbankScraper
 from .garanti import GarantiScraper
 from .yapikredi import YapikrediScraper
 from .isbank import IsbankScraper
 from .finansbank import FinansbankScraper
 
+SCRAPER_CLASSES = {
+    "akbank": AkbankScraper,
+    "garanti": GarantiScraper,
+    "yapikredi": YapikrediScraper,
+    "isbank": IsbankScraper,
+    "finansbank": FinansbankScraper,
+}
+
+
+class ConfiguredScraper(BaseScraper):
+    """Scraper for a bank defined only by its BANK_CONFIG entry."""
+
+    bank_slug = ""
+
+    def __init__(self, **kwargs):
+        config = BANK_CONFIG[self.bank_slug]
+        super().__init__(self.bank_slug, config["name"], config, **kwargs)
+
+
+def scraper_for(bank_slug: str) -> Type[BaseScraper]:
+    if bank_slug in SCRAPER_CLASSES:
+        return SCRAPER_CLASSES[bank_slug]
+    return type(f"{bank_slug.title()}Scraper", (ConfiguredScraper,), {"bank_slug": bank_slug})
+
+
 __all__ = [
     'AkbankScraper',
     'GarantiScraper',
     'YapikrediScraper',
     'IsbankScraper',
     'FinansbankScraper',
+    'ConfiguredScraper',
+    'scraper_for',
 ]
@@ -2,160 +2,713 @@
 Base scraper class - provides common functionality for all bank scrapers.
 """
 import abc
+import asyncio
+import functools
+import json
 import logging
 import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from playwright.sync_api import sync_playwright, Browser, Page
+from urllib.parse import urlsplit
+from typing import List, Optional, Dict, Any, Tuple, Union
+from playwright.async_api import Browser, BrowserContext, Page
+from browser_pool import BrowserPool
 from supabase_client import SupabaseManager
 from normalizer import CampaignNormalizer
-from config import USER_AGENT, VIEWPORT, NAVIGATION_TIMEOUT, SELECTOR_TIMEOUT
+from parse_cache import ParseCache
+from readiness import PageReadiness
+from resource_blocker import ResourceBlocker
+from http_fetcher import HttpFetcher
+from network_capture import NetworkCapture, CAMPAIGN_LIKE_SHARE
+from html_parser import parse
+from http_cache import HttpCache
+from snapshot_store import SnapshotStore, ReplaySource
+from detail_crawler import DetailCrawler
+from rate_limiter import RateLimiter
+from dom_extract import ITEM_EXTRACT_JS, FieldSpec, compile_fields, containers_list, extract_from_html
+from extractor import get_extractor
+from merchant_gazetteer import get_gazetteer
+from merchant_index import MerchantIndex
+from campaign_writer import CampaignWriter
+from config import (
+    NAVIGATION_TIMEOUT, SELECTOR_TIMEOUT, SCROLL_SETTLE_TIMEOUT, SKIP_UNCHANGED_MAX_AGE,
+    PAGINATION_DEFAULTS, SWEEP_MIN_RATIO
+)
 
 
 class BaseScraper(abc.ABC):
-    """Abstract base class for all bank scrapers."""
+    """
+    Base class for all bank scrapers.
 
-    def __init__(self, bank_slug: str, bank_name: str, config: Dict[str, Any]):
+    Listing extraction is driven by the bank's "extract"/"vocab" specs in
+    BANK_CONFIG (see extractor.py); subclasses only override
+    extract_campaigns() for sites the specs cannot describe.
+    """
+
+    def __init__(self, bank_slug: str, bank_name: str, config: Dict[str, Any],
+                 browser_pool: Optional[BrowserPool] = None,
+                 http_fetcher: Optional[HttpFetcher] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 snapshot_store: Optional[SnapshotStore] = None,
+                 replay: Optional[ReplaySource] = None,
+                 detail_crawler: Optional[DetailCrawler] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 parse_cache: Optional[ParseCache] = None,
+                 merchant_index: Optional[MerchantIndex] = None,
+                 run_id: Optional[str] = None,
+                 writer: Optional[CampaignWriter] = None):
         self.bank_slug = bank_slug
         self.bank_name = bank_name
         self.config = config
         self.logger = logging.getLogger(f"scraper.{bank_slug}")
-        self.db = SupabaseManager()
-        self.normalizer = CampaignNormalizer()
+        # Replay runs never touch the database
+        self.db = None if replay else SupabaseManager()
+        self.normalizer = CampaignNormalizer(parse_cache)
+        self.merchant_index = merchant_index or MerchantIndex()
+        # Tags every campaign this run sees; the sweep deactivates the rest
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Orchestrator's write stage; without one, writes run inline
+        self.writer = writer
+        self._write_done: Optional[asyncio.Future] = None
+        self._start_time = time.time()
+        self.browser_pool = browser_pool
+        self._owns_pool = False
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.playwright = None
-        self.context = None
-        self.request_delay = config.get('request_delay', 2)
+        self.readiness: Optional[PageReadiness] = None
+        self.resource_blocker = ResourceBlocker.for_bank(config)
+        self.http_fetcher = http_fetcher
+        self._owns_fetcher = False
+        self.http_cache = http_cache
+        self._http_results: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.unchanged = False
+        self.snapshot_store = snapshot_store
+        self.replay = replay
+        self._current_url: Optional[str] = None
+        self.normalized: List[Dict[str, Any]] = []
+        self.used_browser = False
+        self.detail_crawler = detail_crawler or DetailCrawler()
+        self._idle_detail_pages: List[Tuple[Page, PageReadiness]] = []
+        capture_spec = config.get("network_capture")
+        self.network_capture = NetworkCapture(capture_spec) if capture_spec else None
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.extractor = get_extractor(bank_slug, config)
         self.campaigns_scraped = 0
         self.campaigns_saved = 0
+        self.written: Dict[str, int] = {}
+        self.campaigns_swept = 0
         self.errors: List[str] = []
 
-    def setup_browser(self):
-        """Launch headless Chromium via Playwright."""
+    async def setup_browser(self):
+        """
+        Open an isolated browser context for this scraper.
+
+        Uses the shared pool from the orchestrator when one was passed in,
+        otherwise launches a private pool that is closed in teardown_browser().
+        """
         self.logger.info("Setting up Playwright browser...")
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=True,  # Run in background (production mode)
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security'
-            ]
-        )
-        self.context = self.browser.new_context(
-            locale='tr-TR',
-            user_agent=USER_AGENT,
-            viewport=VIEWPORT,
-            extra_http_headers={
-                'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-            }
-        )
-        self.page = self.context.new_page()
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool()
+            await self.browser_pool.start()
+            self._owns_pool = True
+        self.context = await self.browser_pool.new_context()
+        if self.http_cache is not None:
+            # Registered before the blocker, which therefore runs first
+            await self.http_cache.attach(self.context, self._own_hosts())
+        await self.resource_blocker.attach(self.context)
+        self.browser = self.browser_pool.browser
+        self.page = await self.context.new_page()
+        self.readiness = PageReadiness(self.page)
+        if self.network_capture:
+            self.network_capture.attach(self.page)
         self.logger.info("Browser ready")
 
-    def teardown_browser(self):
-        """Close browser and playwright."""
+    def _own_hosts(self) -> List[str]:
+        """The bank's hosts from its listing URLs, without "www."."""
+        hosts = set()
+        for listing in [self.config, *self.config.get("extra_listings", [])]:
+            for key in ("url", "base_url"):
+                host = (urlsplit(listing.get(key, "")).hostname or "").lower()
+                if host:
+                    hosts.add(host[4:] if host.startswith("www.") else host)
+        return sorted(hosts)
+
+    async def ensure_browser(self):
+        """Set up the browser on first use; HTTP-only runs never launch one."""
+        if self.page is None:
+            await self.setup_browser()
+
+    async def teardown_browser(self):
+        """Release the browser context (and the pool, if we launched it)."""
+        if self._owns_fetcher and self.http_fetcher:
+            await self.http_fetcher.close()
+            self.http_fetcher = None
+            self._owns_fetcher = False
+        if not self.context and not self._owns_pool:
+            return
         if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+            for page, _ in self._idle_detail_pages:
+                await page.close()
+            self._idle_detail_pages.clear()
+            stats = self.resource_blocker.stats()
+            self.logger.info(
+                f"Blocked {stats['blocked_requests']} requests "
+                f"(~{stats['estimated_bytes_saved'] // 1024} KB saved): {stats['by_type']}"
+            )
+            await self.browser_pool.release(self.context)
+            self.context = None
+            self.page = None
+            self.readiness = None
+        if self._owns_pool and self.browser_pool:
+            await self.browser_pool.close()
+            self.browser_pool = None
+            self._owns_pool = False
+        self.browser = None
         self.logger.info("Browser closed")
 
-    def navigate(self, url: str, wait_selector: Optional[str] = None):
-        """Navigate to URL with optional wait for selector."""
+    async def navigate(self, url: str, wait_selector: Optional[str] = None):
+        """
+        Navigate to URL and wait until the page is ready.
+
+        Readiness is event driven (network idle + stable selector count);
+        SELECTOR_TIMEOUT is only the ceiling. The goto itself is paced by
+        the host's rate limiter, shared with HTTP and detail fetches.
+        """
+        self._current_url = url
+
         self.logger.info(f"Navigating to {url}")
         try:
-            self.page.goto(url, wait_until='domcontentloaded', timeout=NAVIGATION_TIMEOUT)
+            await self._goto(self.page, url)
         except Exception as e:
             self.logger.warning(f"Navigation timeout, continuing anyway: {e}")
             # Don't raise - try to parse whatever loaded
 
-        # Wait for JavaScript to render content
-        time.sleep(3)
+        ready = await self.readiness.wait_ready(wait_selector, ceiling_ms=SELECTOR_TIMEOUT)
+        if wait_selector and not ready["count"]:
+            self.logger.warning(f"Selector wait timeout ({wait_selector}), continuing with page content")
+        else:
+            self.logger.info(f"Page ready in {ready['elapsed_ms']}ms")
 
-        if wait_selector:
+    async def _goto(self, page: Page, url: str):
+        """page.goto under the host's rate limit, reporting status/latency back."""
+        async with self.rate_limiter.alimit(url):
+            start = time.monotonic()
+            status = None
             try:
-                self.page.wait_for_selector(wait_selector, timeout=SELECTOR_TIMEOUT)
+                response = await page.goto(url, wait_until='domcontentloaded',
+                                           timeout=NAVIGATION_TIMEOUT)
+                if response is not None:
+                    status = response.status
+            finally:
+                self.rate_limiter.record(url, status, time.monotonic() - start)
+
+    async def paginate(self) -> Dict[str, Any]:
+        """
+        Load the whole listing: scroll to the bottom, and once scrolling stops
+        adding items click the "load more" button (if configured), until the
+        item count stops growing or the item/step/time budget runs out.
+
+        Each step waits for new item nodes or for the network to go quiet
+        without growth, never for a fixed time. Returns {"items", "steps",
+        "elapsed_ms", "stopped"}.
+        """
+        spec = {**PAGINATION_DEFAULTS, **self.config.get("pagination", {})}
+        item_selector = spec["item_selector"] or self.config["campaign_selector"]
+        start = time.monotonic()
+        count = await self.readiness.count(item_selector)
+        steps = stale = 0
+        stopped = "converged"
+
+        while stale < spec["stale_rounds"]:
+            if count >= spec["max_items"]:
+                stopped = "max_items"
+                break
+            if steps >= spec["max_steps"]:
+                stopped = "max_steps"
+                break
+            remaining_ms = spec["time_budget_ms"] - (time.monotonic() - start) * 1000
+            if remaining_ms <= 0:
+                stopped = "time_budget"
+                break
+            step_timeout = int(min(SCROLL_SETTLE_TIMEOUT, remaining_ms))
+            steps += 1
+
+            grew = False
+            if spec["scroll"]:
+                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                result = await self.readiness.wait_for_more(item_selector, count, step_timeout)
+                grew, count = result["grew"], result["count"]
+            if not grew and spec["more_selector"]:
+                if not await self._click_more(spec["more_selector"]):
+                    stopped = "no_more_button"
+                    break
+                result = await self.readiness.wait_for_more(item_selector, count, step_timeout)
+                grew, count = result["grew"], result["count"]
+            stale = 0 if grew else stale + 1
+
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        self.logger.info(f"Pagination: {count} items after {steps} steps in {elapsed_ms}ms ({stopped})")
+        return {"items": count, "steps": steps, "elapsed_ms": elapsed_ms, "stopped": stopped}
+
+    async def _click_more(self, selector: str) -> bool:
+        """Click a visible "load more" button; False if there is none."""
+        try:
+            button = self.page.locator(selector).first
+            if not await button.is_visible():
+                return False
+            await button.click(timeout=SCROLL_SETTLE_TIMEOUT)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Load-more click failed ({selector}): {e}")
+            return False
+
+    async def extract_items(self, container: Union[str, List[str]],
+                            fields: Dict[str, FieldSpec],
+                            html: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Extract one dict per `container` match, fields per dom_extract specs.
+
+        With `html` (static fetch), the spec is applied to that HTML. Otherwise
+        it runs inside the current page in a single evaluate() call and only
+        the compact item list crosses over from Chromium (and is snapshotted).
+        """
+        if html is not None:
+            return extract_from_html(html, container, fields)
+        if self.replay:
+            items = self.replay.items(self._current_url)
+            if items is not None:
+                return items
+            # Runs recorded before in-page extraction stored the rendered DOM
+            return extract_from_html(self.replay.html(self._current_url) or "", container, fields)
+
+        items = await self.page.evaluate(
+            ITEM_EXTRACT_JS, [containers_list(container), compile_fields(fields)]
+        )
+        self._snapshot(self._current_url, json.dumps(items, ensure_ascii=False), "items", "evaluate")
+        return items
+
+    def _snapshot(self, url: str, content: str, kind: str, source: str):
+        if self.snapshot_store is not None:
+            self.snapshot_store.record(self.bank_slug, url, content, kind=kind, source=source)
+
+    async def open_listing(self, url: str) -> Optional[str]:
+        """
+        Load a listing page using the cheapest path that works.
+
+        Plain HTTP is tried first when the bank doesn't need a browser
+        (needs_playwright False) or allows probing static HTML (http_probe);
+        the static page is used only if campaign_selector matches in it and
+        its HTML is returned. Otherwise the page is rendered in Playwright,
+        load_more() runs, and None is returned with self.page left on the
+        listing, so callers read captured JSON or extract_items() from the page.
+        """
+        if self.replay:
+            return self._replay_listing(url)
+
+        needs_playwright = self.config.get("needs_playwright", True)
+        if not needs_playwright or self.config.get("http_probe", True):
+            html = await self._fetch_static(url)
+            if html is not None:
+                return html
+
+        await self.ensure_browser()
+        self.used_browser = True
+        if self.network_capture:
+            # captured_campaigns() must only see this listing's responses
+            self.network_capture.reset()
+        await self.navigate(url, self.config.get("wait_selector"))
+        await self.load_more()
+        return None
+
+    def _replay_listing(self, url: str) -> Optional[str]:
+        """
+        Replay counterpart of open_listing(): None (read captured JSON /
+        extract_items) when the recorded run rendered the page, else the
+        recorded HTML.
+        """
+        self._current_url = url
+        if self.network_capture and self.replay.json_payloads:
+            self.used_browser = True
+            return None
+        if self.replay.has_items(url):
+            return None
+        return self.replay.html(url) or ""
+
+    async def _fetch_http(self, url: str) -> Optional[Dict[str, Any]]:
+        """HTTP fetch through the shared fetcher, at most once per URL per run."""
+        if url in self._http_results:
+            return self._http_results[url]
+        if self.http_fetcher is None:
+            self.http_fetcher = HttpFetcher(cache=self.http_cache, rate_limiter=self.rate_limiter)
+            self._owns_fetcher = True
+        result = await self.http_fetcher.fetch(url)
+        self._http_results[url] = result
+        return result
+
+    async def page_changed(self, url: str) -> bool:
+        """
+        Did this page change since it was last fully processed?
+
+        Costs one conditional request (usually a 304). Always True without a
+        cache, on fetch errors, and once SKIP_UNCHANGED_MAX_AGE has passed.
+        """
+        if self.http_cache is None:
+            return True
+        result = await self._fetch_http(url)
+        if not result or result["status"] != 200:
+            return True
+        return not self.http_cache.is_processed(url, result["body_hash"], SKIP_UNCHANGED_MAX_AGE)
+
+    def _mark_processed(self, url: str):
+        result = self._http_results.get(url)
+        if self.http_cache is not None and result and result["status"] == 200:
+            self.http_cache.mark_processed(url, result["body_hash"])
+
+    async def _fetch_static(self, url: str) -> Optional[str]:
+        """Fetch over HTTP; None unless the response contains campaign items."""
+        result = await self._fetch_http(url)
+        if not result or result["status"] != 200:
+            status = result["status"] if result else "error"
+            self.logger.info(f"HTTP fetch unusable ({status}), falling back to browser")
+            return None
+
+        selector = self.config.get("campaign_selector")
+        if selector and not parse(result["html"], scope=selector).select_one(selector):
+            self.logger.info(f"Static HTML has no '{selector}', falling back to browser")
+            return None
+
+        self.logger.info(f"Using static HTML for {url} ({result['elapsed_ms']}ms)")
+        self._snapshot(url, result["html"], "html", "http")
+        return result["html"]
+
+    async def fetch_detail(self, url: str, use_browser: bool = False) -> Optional[str]:
+        """
+        HTML of one campaign detail page, for the DetailCrawler.
+
+        use_browser False: plain HTTP (through the cache), None unless 200.
+        use_browser True: render it in a page of this bank's context. Detail
+        pages are opened alongside the listing page and reused, so several
+        can load at once without disturbing self.page.
+        """
+        if self.replay:
+            return self.replay.html(url)
+
+        if not use_browser:
+            if self.http_fetcher is None:
+                self.http_fetcher = HttpFetcher(cache=self.http_cache, rate_limiter=self.rate_limiter)
+                self._owns_fetcher = True
+            result = await self.http_fetcher.fetch(url)
+            if not result or result["status"] != 200:
+                return None
+            self._snapshot(url, result["html"], "html", "http")
+            return result["html"]
+
+        await self.ensure_browser()
+        self.used_browser = True
+        if self._idle_detail_pages:
+            page, readiness = self._idle_detail_pages.pop()
+        else:
+            page = await self.context.new_page()
+            readiness = PageReadiness(page)
+        try:
+            try:
+                await self._goto(page, url)
             except Exception as e:
-                self.logger.warning(f"Selector wait timeout ({wait_selector}), continuing with page content")
+                self.logger.debug(f"Detail navigation timeout for {url}: {e}")
+            await readiness.wait_ready(None, ceiling_ms=SELECTOR_TIMEOUT)
+            html = await page.content()
+        finally:
+            self._idle_detail_pages.append((page, readiness))
+        self._snapshot(url, html, "html", "browser")
+        return html
+
+    async def load_more(self):
+        """
+        Hook run after navigation on the browser path only. Drives the
+        pagination (scroll / "load more") configured for the bank.
+        """
+        await self.paginate()
+
+    async def captured_campaigns(self, card_map: Dict[str, int],
+                                 listing_url: str) -> List[Dict[str, Any]]:
+        """
+        Raw campaigns read straight from the JSON feeds recorded by network
+        capture, or [] if capture is off or saw nothing that looks like
+        campaigns, in which case the listing is read from the DOM.
+        """
+        if not self.network_capture or not self.used_browser:
+            return []
+        capture = self.network_capture
+        if self.replay:
+            capture.payloads = self.replay.payloads()
+        else:
+            await capture.drain()
+            for url, payload in capture.payloads:
+                self._snapshot(url, json.dumps(payload, ensure_ascii=False), "json", "capture")
+
+        items = capture.items()
+        share = capture.campaign_like_share(items)
+        if items and share < CAMPAIGN_LIKE_SHARE:
+            self.logger.warning(f"Network capture: only {share:.0%} of {len(items)} captured items "
+                                f"look like campaigns, reading the DOM instead")
+            return []
+
+        base_url = self.config.get("base_url", "")
+        campaigns = []
+        seen_titles = set()
+        for item in items:
+            title = capture.field(item, "title")
+            if not title or len(title) < 5 or title in seen_titles:
+                continue
+            seen_titles.add(title)
+
+            source_url = capture.field(item, "source_url")
+            if source_url and not source_url.startswith('http'):
+                source_url = f"{base_url}{source_url}"
+            description = capture.field(item, "description") or title
 
-        time.sleep(self.request_delay)
+            campaigns.append({
+                "card_id": self._match_card(title, card_map),
+                "title": title[:200],
+                "description": description[:500],
+                "merchant_name": self._extract_merchant(title),
+                "discount_text": self._extract_discount_text(title),
+                "conditions": "",
+                "source_url": source_url or listing_url,
+                "date_text": capture.date_text(item),
+            })
+
+        if campaigns:
+            self.logger.info(f"Network capture: {len(campaigns)} campaigns from "
+                             f"{len(capture.payloads)} responses")
+        return campaigns
+
+    def _match_card(self, text: str, card_map: Dict[str, int]) -> int:
+        return self.extractor.match_card(text, card_map)
+
+    def _extract_merchant(self, title_text: str) -> str:
+        gazetteer = get_gazetteer()
+        return self.normalizer.cache.memo(
+            f"merchant:{self.extractor.vocab_key}:{gazetteer.digest}", title_text, self._guess_merchant
+        )
+
+    def _guess_merchant(self, title_text: str) -> str:
+        # Known merchants by canonical name, then the bank's title heuristics
+        entry = get_gazetteer().find(title_text)
+        if entry:
+            return entry["name"]
+        return self.extractor.vocab.merchant(title_text)
+
+    def _extract_discount_text(self, text: str) -> str:
+        return self.extractor.vocab.discount_text(text)
 
     def run(self) -> Dict[str, Any]:
+        """Run the scraper to completion on a fresh event loop. Returns summary dict."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict[str, Any]:
         """
         Main execution flow. Returns summary dict.
 
+        Blocking Supabase calls are pushed to a worker thread so that other
+        scrapers sharing the event loop keep running while this one writes.
+        With a CampaignWriter, steps 5-6 are queued on it and run_async()
+        returns once the browser work is done; finish_writes() waits for them.
+
         Steps:
-        1. Setup browser
-        2. Get card IDs from Supabase for this bank
-        3. Extract raw campaign data (implemented by subclass)
+        1. Get card IDs from Supabase for this bank
+        2. If the listing is unchanged (skip_if_unchanged banks), only run the
+           expiry part of step 6
+        3. Extract raw campaign data (per the bank's extract specs; the browser is
+           set up lazily by open_listing() only if plain HTTP isn't enough),
+           then enrich it from the detail pages
         4. Normalize each campaign
-        5. Write to Supabase (upsert with dedup)
-        6. Mark expired campaigns as inactive
+        5. Write new/changed campaigns to Supabase (bulk upsert), touch unchanged ones
+        6. Mark expired campaigns, and campaigns this run did not see, as inactive
         7. Cleanup
         """
         self.logger.info(f"Starting scraper for {self.bank_name}")
-        start_time = time.time()
+        self._start_time = time.time()
 
         try:
-            self.setup_browser()
-
             # Step 1: Get card IDs from Supabase for this bank
-            card_map = self.db.get_cards_for_bank(self.bank_slug)
+            if self.replay:
+                card_map = self.replay.card_map
+            else:
+                card_map = await asyncio.to_thread(self.db.get_cards_for_bank, self.bank_slug)
 
             if not card_map:
                 raise ValueError(f"No cards found for bank: {self.bank_slug}")
+            if self.snapshot_store is not None:
+                self.snapshot_store.set_card_map(self.bank_slug, card_map)
 
-            # Step 2: Extract raw campaign data (implemented by subclass)
-            raw_campaigns = self.extract_campaigns(card_map)
-            self.campaigns_scraped = len(raw_campaigns)
-            self.logger.info(f"Extracted {self.campaigns_scraped} raw campaigns")
-
-            # Step 3: Normalize each campaign
-            normalized = []
-            for raw in raw_campaigns:
-                try:
-                    norm = self.normalizer.normalize(raw)
-                    normalized.append(norm)
-                except Exception as e:
-                    self.logger.warning(f"Normalization failed for campaign: {raw.get('title', 'unknown')} - {e}")
-                    self.errors.append(f"Normalization: {str(e)}")
-
-            self.logger.info(f"Normalized {len(normalized)} campaigns")
-
-            # Step 4: Write to Supabase (upsert with dedup)
-            self.campaigns_saved = self.db.upsert_campaigns(normalized, self.bank_slug)
-
-            # Step 5: Mark expired campaigns as inactive
-            self.db.deactivate_expired_campaigns(list(card_map.values()))
+            # Step 2: Cheap conditional fetch of the listing
+            listing_url = self.config["urls"]["campaigns"]
+            if (self.config.get("skip_if_unchanged") and not self.replay
+                    and not await self.page_changed(listing_url)):
+                self.logger.info("Listing unchanged since last processed run, skipping")
+                self.unchanged = True
+                # Campaigns still run out on their end_date
+                expire = functools.partial(self._expire, list(card_map.values()))
+                if self.writer is None:
+                    await expire()
+                else:
+                    self._write_done = await self.writer.submit(self.bank_slug, expire)
+            else:
+                await self._scrape_and_save(card_map)
 
         except Exception as e:
             self.logger.error(f"Scraper failed for {self.bank_name}: {e}")
             self.errors.append(f"Fatal: {str(e)}")
 
         finally:
-            self.teardown_browser()
+            await self.teardown_browser()
 
-        elapsed = round(time.time() - start_time, 2)
-        summary = {
+        if self._write_done is not None:
+            self.logger.info(f"Scraped {self.campaigns_scraped} campaigns, writes queued")
+            return self._summary()
+        return await self.finish_writes()
+
+    async def finish_writes(self) -> Dict[str, Any]:
+        """Wait for this bank's queued writes; returns the final summary dict."""
+        if self._write_done is not None:
+            try:
+                await self._write_done
+            except Exception as e:
+                self.errors.append(f"Write: {str(e)}")
+            self._write_done = None
+        summary = self._summary()
+        self.logger.info(f"Completed: {summary}")
+        return summary
+
+    def _summary(self) -> Dict[str, Any]:
+        elapsed = round(time.time() - self._start_time, 2)
+        return {
             "bank": self.bank_name,
             "scraped": self.campaigns_scraped,
             "saved": self.campaigns_saved,
             "errors": len(self.errors),
             "error_details": self.errors[:5],  # limit stored errors
-            "elapsed_seconds": elapsed
+            "elapsed_seconds": elapsed,
+            "unchanged": self.unchanged,
+            "written": self.written,
+            "swept": self.campaigns_swept,
         }
-        self.logger.info(f"Completed: {summary}")
-        return summary
 
-    @abc.abstractmethod
-    def extract_campaigns(self, card_map: Dict[str, int]) -> List[Dict[str, Any]]:
+    async def _scrape_and_save(self, card_map: Dict[str, int]):
+        # Step 3a: Load the stored campaigns in a worker thread while the site is scraped
+        bank_state = None
+        if not self.replay:
+            bank_state = asyncio.create_task(
+                asyncio.to_thread(self.db.load_bank_state, list(card_map.values()))
+            )
+        try:
+            normalized = await self._scrape_and_normalize(card_map)
+        except BaseException:
+            if bank_state is not None:
+                bank_state.cancel()
+            raise
+
+        self.normalized = normalized
+        if self.replay:
+            return
+
+        write = functools.partial(self._write, normalized, card_map, bank_state)
+        if self.writer is None:
+            await write()
+        else:
+            # Runs on the shared writer while the next bank is scraped
+            try:
+                self._write_done = await self.writer.submit(self.bank_slug, write)
+            except BaseException:
+                bank_state.cancel()
+                raise
+
+    async def _expire(self, card_ids: List[int]):
+        await asyncio.to_thread(self.db.deactivate_expired_campaigns, card_ids)
+
+    async def _write(self, normalized: List[Dict[str, Any]], card_map: Dict[str, int],
+                     bank_state: "asyncio.Task"):
+        # Step 5: Write new and changed campaigns to Supabase, touch unchanged ones
+        state = await bank_state
+        written = await asyncio.to_thread(
+            self.db.upsert_campaigns, normalized, self.bank_slug, state, self.run_id
+        )
+        self.written = written
+        self.campaigns_saved = written["inserted"] + written["updated"] + written["unchanged"]
+        if written["failed"]:
+            self.errors.append(f"DB: {written['failed']} campaigns failed to save")
+
+        # Step 6: Mark expired campaigns as inactive
+        await self._expire(list(card_map.values()))
+
+        # Step 6b: Mark campaigns this run did not see as inactive
+        if await self._should_sweep(written, list(card_map.values())):
+            self.campaigns_swept = await asyncio.to_thread(
+                self.db.sweep_unseen_campaigns, list(card_map.values()), self.run_id
+            )
+
+        if not self.errors:
+            self._mark_processed(self.config["urls"]["campaigns"])
+
+    async def _should_sweep(self, written: Dict[str, int], card_ids: List[int]) -> bool:
+        """
+        Sweep only after a complete, plausible run: no errors, no failed
+        writes, and at least sweep_min_ratio of the active campaigns seen.
+        The active count comes from the database (count='exact').
+        """
+        seen = written["inserted"] + written["updated"] + written["unchanged"]
+        if self.errors or written["failed"] or not seen:
+            self.logger.warning(f"Not sweeping unseen campaigns: {seen} seen, {len(self.errors)} errors")
+            return False
+        active = await asyncio.to_thread(self.db.count_active_campaigns, card_ids)
+        if active is None:
+            self.logger.warning("Not sweeping unseen campaigns: active campaigns could not be counted")
+            return False
+        min_ratio = self.config.get("sweep_min_ratio", SWEEP_MIN_RATIO)
+        if seen < active * min_ratio:
+            self.logger.warning(
+                f"Not sweeping unseen campaigns: only {seen} seen, {active} active "
+                f"(minimum ratio {min_ratio})"
+            )
+            return False
+        return True
+
+    async def _scrape_and_normalize(self, card_map: Dict[str, int]) -> List[Dict[str, Any]]:
+        # Step 3: Extract raw campaign data (per the bank's extract specs)
+        raw_campaigns = await self.extract_campaigns(card_map)
+        self.campaigns_scraped = len(raw_campaigns)
+        self.logger.info(f"Extracted {self.campaigns_scraped} raw campaigns")
+
+        # Step 3b: Fill dates/conditions from the campaigns' detail pages
+        if self.config.get("detail", {}).get("enabled", True):
+            await self.detail_crawler.crawl(self, raw_campaigns)
+
+        # Stored with the run's snapshots so renormalize.py can redo step 4 offline
+        self._snapshot(self.config["urls"]["campaigns"],
+                       json.dumps(raw_campaigns, ensure_ascii=False), "raw", "extract")
+
+        # Step 4: Normalize each campaign
+        normalized, failures = self.normalizer.normalize_batch(raw_campaigns)
+        for failure in failures:
+            self.logger.warning(f"Normalization failed for campaign: {failure['title']} - {failure['error']}")
+            self.errors.append(f"Normalization: {failure['error']}")
+
+        self.logger.info(f"Normalized {len(normalized)} campaigns")
+
+        # Step 4b: Write near-duplicate merchants under one canonical pattern
+        if not self.replay and not self.merchant_index.loaded:
+            self.merchant_index.extend(await asyncio.to_thread(self.db.get_active_merchant_patterns))
+            self.merchant_index.loaded = True
+        for campaign in normalized:
+            campaign["merchant_pattern"] = self.merchant_index.canonical(campaign["merchant_pattern"])
+
+        return normalized
+
+    async def extract_campaigns(self, card_map: Dict[str, int]) -> List[Dict[str, Any]]:
         """
-        Subclass must implement this.
+        Extract raw campaigns from the bank's listing page(s) with its
+        compiled extraction specs.
 
         Args:
             card_map: Dict mapping card slug to card_id
@@ -172,4 +725,4 @@ class BaseScraper(abc.ABC):
             - source_url (str)
             - date_text (str, optional) -- raw date text for parsing
         """
-        pass
+        return await self.extractor.extract(self, card_map)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the HTML parser backends over recorded pages.
+
+Reads the HTML pages stored by a scrape run (data/snapshots, see
+snapshot_store.py) and, for every installed backend, times parsing each page
+in full and scoped to the bank's campaign_selector, followed by selecting
+the campaign items. Each backend/mode runs in a fresh process so peak RSS
+growth (which includes lxml's and selectolax's native trees) is comparable.
+
+Usage:
+    python bench_parsers.py                   # latest recorded run
+    python bench_parsers.py --run 20260213_153001 --repeat 5
+    python bench_parsers.py --html page1.html page2.html --scope .box-item
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+from config import BANK_CONFIG
+from snapshot_store import SnapshotStore
+import html_parser
+
+# (label, html, scope selector)
+Page = Tuple[str, str, Optional[str]]
+
+
+def load_recorded_pages(run_id: Optional[str]) -> List[Page]:
+    runs = SnapshotStore.list_runs()
+    if not runs:
+        return []
+    run_id = run_id or runs[-1]
+    store = SnapshotStore(run_id)
+    manifest = SnapshotStore.load_manifest(run_id)
+    pages = []
+    for bank_slug, bank in manifest["banks"].items():
+        scope = BANK_CONFIG.get(bank_slug, {}).get("campaign_selector")
+        for page in bank["pages"]:
+            if page["kind"] == "html":
+                html = store.get(page["digest"]).decode("utf-8", errors="replace")
+                pages.append((f"{bank_slug} {page['url']}", html, scope))
+    print(f"Run {run_id}: {len(pages)} recorded HTML pages")
+    return pages
+
+
+def _max_rss_kb() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage  # bytes on macOS
+
+
+def _measure(backend: str, scoped: bool, pages: List[Page], repeat: int, queue):
+    # Warm up imports and caches outside the measurement
+    html_parser.parse("<html><body><p>x</p></body></html>", backend=backend)
+    rss_before = _max_rss_kb()
+
+    def one_pass() -> int:
+        items = 0
+        for _, html, scope in pages:
+            root = html_parser.parse(html, scope=scope if scoped else None, backend=backend)
+            if scope:
+                items += len(root.select(scope))
+            del root
+        return items
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        items = one_pass()
+    elapsed = time.perf_counter() - start
+    rss_growth = _max_rss_kb() - rss_before
+
+    # tracemalloc slows parsing down a lot, so heap size gets its own pass
+    tracemalloc.start()
+    one_pass()
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        "ms_per_page": elapsed * 1000 / (len(pages) * repeat),
+        "rss_growth_mb": rss_growth / 1024,
+        "py_peak_mb": py_peak / (1024 * 1024),
+        "items": items,
+    })
+
+
+def run_isolated(backend: str, scoped: bool, pages: List[Page], repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(backend, scoped, pages, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on recorded pages")
+    parser.add_argument('--run', help='Snapshot run id (default: latest)', metavar='RUN_ID')
+    parser.add_argument('--html', nargs='+', help='Benchmark these HTML files instead', metavar='FILE')
+    parser.add_argument('--scope', help='With --html: container selector to scope to')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the pages (default: 3)')
+    args = parser.parse_args()
+
+    if args.html:
+        pages = []
+        for path in args.html:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((path, f.read(), args.scope))
+    else:
+        pages = load_recorded_pages(args.run)
+    if not pages:
+        print("No pages to benchmark: run a scrape first (snapshots) or pass --html")
+        return 1
+
+    total_kb = sum(len(html) for _, html, _ in pages) // 1024
+    print(f"{len(pages)} pages, {total_kb} KB of HTML, {args.repeat} passes\n")
+    print(f"{'backend':12s} {'mode':7s} {'ms/page':>9s} {'RSS +MB':>8s} {'py heap MB':>11s} {'items':>6s}")
+    for backend in html_parser.available_backends():
+        for scoped in (False, True):
+            r = run_isolated(backend, scoped, pages, args.repeat)
+            print(f"{backend:12s} {'scoped' if scoped else 'full':7s} {r['ms_per_page']:9.2f} "
+                  f"{r['rss_growth_mb']:8.1f} {r['py_peak_mb']:11.1f} {r['items']:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
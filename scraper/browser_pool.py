@@ -0,0 +1,143 @@
+"""
+Shared Chromium browser pool.
+
+One long-lived browser is launched per scrape run and each scraper gets its
+own isolated BrowserContext from it, instead of paying a cold Chromium launch
+per bank. The browser is health-checked before every context is handed out
+and recycled after a fixed number of contexts to keep RSS bounded: once it
+has served that many, new_context() waits until the open contexts are
+released, then relaunches it.
+"""
+import asyncio
+import logging
+from typing import Optional, Set
+from playwright.async_api import async_playwright, Browser, BrowserContext
+from config import (
+    USER_AGENT, VIEWPORT, BROWSER_ARGS, EXTRA_HTTP_HEADERS, BROWSER_RECYCLE_AFTER
+)
+
+logger = logging.getLogger("scraper.browser_pool")
+
+
+class BrowserPool:
+    """Owns a single Chromium instance and hands out isolated contexts."""
+
+    def __init__(self, recycle_after: int = BROWSER_RECYCLE_AFTER, headless: bool = True):
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self.launches = 0
+        self.contexts_served = 0
+        self._served_since_launch = 0
+        self._open_contexts: Set[BrowserContext] = set()
+        self._lock = asyncio.Lock()
+        # Notified when a context is released, for new_context() waiting to recycle
+        self._released = asyncio.Condition(self._lock)
+
+    async def __aenter__(self) -> "BrowserPool":
+        # Launch lazily on the first new_context() so a launch failure is
+        # reported against the bank that needed it, like before pooling
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Start Playwright and launch the browser."""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        await self._launch()
+
+    async def _launch(self):
+        logger.info("Launching shared Chromium browser...")
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,  # Run in background (production mode)
+            args=BROWSER_ARGS
+        )
+        self.launches += 1
+        self._served_since_launch = 0
+
+    async def _close_browser(self):
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.warning(f"Error while closing browser: {e}")
+        self.browser = None
+
+    async def _recycle(self, reason: str):
+        logger.info(f"Recycling browser ({reason})")
+        await self._close_browser()
+        await self._launch()
+
+    def is_healthy(self) -> bool:
+        """True if the browser process is up and connected."""
+        return self.browser is not None and self.browser.is_connected()
+
+    async def new_context(self) -> BrowserContext:
+        """
+        Create an isolated context with the scraper's locale, user agent and headers.
+
+        The browser is relaunched first if it has died, or if it has served
+        `recycle_after` contexts; in that case no new context is handed out
+        until the ones still open are released.
+        """
+        # Concurrent scrapers must not launch or recycle the browser twice
+        async with self._released:
+            while (self._served_since_launch >= self.recycle_after and self._open_contexts
+                   and self.is_healthy()):
+                await self._released.wait()
+
+            if self.browser is None:
+                await self.start()
+            elif not self.is_healthy():
+                await self._recycle("health check failed")
+            elif self._served_since_launch >= self.recycle_after:
+                await self._recycle(f"served {self._served_since_launch} contexts")
+
+            try:
+                context = await self._create_context()
+            except Exception as e:
+                # Browser may have crashed between the health check and now
+                logger.warning(f"Context creation failed, relaunching browser: {e}")
+                await self._recycle("context creation failed")
+                context = await self._create_context()
+
+            self._open_contexts.add(context)
+            self._served_since_launch += 1
+            self.contexts_served += 1
+        return context
+
+    async def _create_context(self) -> BrowserContext:
+        return await self.browser.new_context(
+            locale='tr-TR',
+            user_agent=USER_AGENT,
+            viewport=VIEWPORT,
+            extra_http_headers=EXTRA_HTTP_HEADERS,
+        )
+
+    async def release(self, context: BrowserContext):
+        """Close a context previously returned by new_context()."""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Error while closing context: {e}")
+        async with self._released:
+            self._open_contexts.discard(context)
+            self._released.notify_all()
+
+    async def close(self):
+        """Close any open contexts, the browser and Playwright."""
+        for context in list(self._open_contexts):
+            await self.release(context)
+        await self._close_browser()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        if not self.launches:
+            return
+        logger.info(
+            f"Browser pool closed ({self.launches} launches, "
+            f"{self.contexts_served} contexts served)"
+        )
@@ -0,0 +1,116 @@
+"""
+Background write stage shared by all scrapers in a run.
+
+A scraper that has normalized its campaigns submits its database writes
+(upsert, expiry and sweep; see BaseScraper._write) to the writer and
+returns, so the next bank's browser work starts while this bank's rows are
+written. One writer task runs the submitted writes in order, each in a
+worker thread. The queue is bounded: when WRITE_QUEUE_SIZE banks are waiting,
+submit() blocks until the writer catches up, which keeps a slow database
+from piling up every bank's campaigns in memory.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from config import WRITE_QUEUE_SIZE
+
+logger = logging.getLogger("scraper.writer")
+
+
+class CampaignWriter:
+    """Bounded queue of bank writes, drained by one task."""
+
+    def __init__(self, maxsize: int = WRITE_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failed = 0
+        self.waited = 0.0
+
+    async def __aenter__(self) -> "CampaignWriter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def submit(self, bank_slug: str, write: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """
+        Queue write() for the writer task; waits only while the queue is full.
+        Returns a future for write()'s result. Raises RuntimeError if the
+        writer task is not running (never started, closed, or died).
+        """
+        self._check_running()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        start = loop.time()
+        put = asyncio.ensure_future(self.queue.put((bank_slug, write, future)))
+        try:
+            # Don't wait on a full queue that a dead writer will never drain
+            await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            put.cancel()
+            raise
+        if self._task.done():
+            put.cancel()
+            self._fail_pending()
+            self._check_running()
+        waited = loop.time() - start
+        self.waited += waited
+        if waited > 1:
+            logger.info(f"{bank_slug}: waited {waited:.1f}s for the write queue")
+        return future
+
+    def _check_running(self):
+        if self._task is None or self._task.done():
+            raise RuntimeError("CampaignWriter is not running")
+
+    async def _run(self):
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is None:
+                    break
+                bank_slug, write, future = item
+                try:
+                    result = await write()
+                except Exception as e:
+                    logger.error(f"Write failed for {bank_slug}: {e}")
+                    self.failed += 1
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                except BaseException as e:
+                    # Cancelled or interrupted mid-write: fail the write, stop the writer
+                    logger.error(f"Writer stopped during {bank_slug}: {e!r}")
+                    self.failed += 1
+                    if not future.done():
+                        if isinstance(e, asyncio.CancelledError):
+                            future.cancel()
+                        else:
+                            future.set_exception(e)
+                    raise
+                self.written += 1
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        """Fail the writes still queued once the writer task has stopped."""
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not None and not item[2].done():
+                item[2].set_exception(RuntimeError(f"Writer stopped before writing {item[0]}"))
+
+    async def close(self):
+        """Finish every queued write, then stop the writer task."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if not task.done():
+            await self.queue.put(None)
+        await task
+
+    def stats(self) -> Dict[str, Any]:
+        return {"banks_written": self.written, "failed": self.failed, "queue_wait_s": round(self.waited, 2)}
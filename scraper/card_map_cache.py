@@ -0,0 +1,103 @@
+"""
+Cross-run cache of every bank's card map.
+
+The cards table rarely changes, so all banks' {card_slug: card_id} maps
+are loaded with one query and kept in a JSON file (data/card_maps.json) for
+CARD_MAP_CACHE_TTL seconds. Every scraper and script in the process shares
+one in-memory copy. invalidate() (or `python main.py --refresh-cards`)
+drops both copies, e.g. after cards were added or renumbered.
+
+A bank without cards is cached as an empty map, so it does not trigger a
+reload on every call. When a reload fails, a bank already in the stale
+cache keeps its old map (with a warning) rather than losing its cards.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from config import CARD_MAP_CACHE_PATH, CARD_MAP_CACHE_TTL
+
+logger = logging.getLogger("scraper.card_map_cache")
+
+CardMaps = Dict[str, Dict[str, int]]
+
+
+class CardMapCache:
+    """All banks' card maps, in memory and on disk, with a TTL."""
+
+    def __init__(self, path: Optional[str] = CARD_MAP_CACHE_PATH, ttl: float = CARD_MAP_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._maps: Optional[CardMaps] = None
+        self._saved_at = 0.0
+        self.loads = 0
+
+    def get(self, bank_slug: str, load_all: Callable[[], Optional[CardMaps]]) -> Optional[Dict[str, int]]:
+        """
+        The bank's card map ({} if it has no cards). load_all() (one query
+        for every bank) runs only when the cache is stale or does not know
+        the bank. If load_all() fails, the stale map is returned when there
+        is one, else None.
+        """
+        with self._lock:
+            if self._maps is None:
+                self._read()
+            fresh = self._maps is not None and time.time() - self._saved_at < self.ttl
+            if not fresh or bank_slug not in self._maps:
+                maps = load_all()
+                if maps is None:
+                    if self._maps is not None and bank_slug in self._maps:
+                        logger.warning(f"Card map reload failed, using the stale map for {bank_slug}")
+                        return self._maps[bank_slug]
+                    return None
+                self.loads += 1
+                # Remembered as having no cards until the maps are reloaded
+                maps.setdefault(bank_slug, {})
+                self._maps, self._saved_at = maps, time.time()
+                self._write()
+            return self._maps[bank_slug]
+
+    def invalidate(self):
+        """Forget the cached maps; the next get() reloads them."""
+        with self._lock:
+            self._maps = None
+            self._saved_at = 0.0
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+        logger.info("Card map cache invalidated")
+
+    def _read(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._maps, self._saved_at = data["banks"], data["saved_at"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable card map cache {self.path}: {e}")
+
+    def _write(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": self._saved_at, "banks": self._maps}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write card map cache {self.path}: {e}")
+
+
+_cache: Optional[CardMapCache] = None
+
+
+def get_card_map_cache() -> CardMapCache:
+    """The process-wide card map cache."""
+    global _cache
+    if _cache is None:
+        _cache = CardMapCache()
+    return _cache
@@ -0,0 +1,92 @@
+"""
+Card keyword matching with one Aho-Corasick automaton.
+
+Every card keyword in BANK_CONFIG ("cards") is loaded once into a single
+automaton, so finding all cards a campaign text mentions is one pass over
+the text, however many cards and keywords there are. Text and keywords are
+folded the same way: lowercase, with the Turkish I/İ/ı all folded to "i",
+so "WİNGS", "WINGS" and "wıngs" all match "wings". Keywords match anywhere
+in the text, as plain substrings.
+
+When a text mentions several of a bank's cards, the card is chosen by,
+in order:
+1. most distinct keywords matched
+2. earliest first match in the text
+3. order of the bank's card map
+With no match the campaign goes to the bank's default card: "default_card"
+in its BANK_CONFIG entry, else the first card in the card map.
+"""
+import logging
+from typing import Dict, Any, List, Optional
+from keyword_automaton import KeywordAutomaton, fold
+from config import BANK_CONFIG
+
+logger = logging.getLogger("scraper.card_matcher")
+
+
+class CardMatcher:
+    """All banks' card keywords in one automaton."""
+
+    def __init__(self, bank_config: Dict[str, Any] = BANK_CONFIG):
+        keywords: Dict[str, List[str]] = {}
+        self.defaults: Dict[str, str] = {}
+        for bank_slug, config in bank_config.items():
+            for card_slug, card_keywords in config.get("cards", {}).items():
+                for keyword in card_keywords:
+                    keywords.setdefault(fold(keyword), []).append(card_slug)
+            if config.get("default_card"):
+                self.defaults[bank_slug] = config["default_card"]
+        self.card_slugs = {slug for slugs in keywords.values() for slug in slugs}
+
+        self._automaton = KeywordAutomaton(keywords)
+
+    def matches(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """Every card mentioned in text: {card_slug: {"keywords": set, "first": index}}."""
+        found: Dict[str, Dict[str, Any]] = {}
+        if not text:
+            return found
+        for start, keyword, slugs in self._automaton.iter(fold(text)):
+            for slug in slugs:
+                hit = found.get(slug)
+                if hit is None:
+                    found[slug] = {"keywords": {keyword}, "first": start}
+                else:
+                    hit["keywords"].add(keyword)
+                    hit["first"] = min(hit["first"], start)
+        return found
+
+    def match(self, text: str, card_map: Dict[str, int], bank_slug: Optional[str] = None) -> int:
+        """card_id for text among the bank's cards (see module docstring for the policy)."""
+        found = self.matches(text)
+        # Cards in the database but not in config match on their slug
+        folded = None
+        for card_slug in card_map:
+            if card_slug not in self.card_slugs:
+                folded = folded if folded is not None else fold(text or "")
+                index = folded.find(fold(card_slug))
+                if index >= 0:
+                    found[card_slug] = {"keywords": {card_slug}, "first": index}
+
+        order = {card_slug: i for i, card_slug in enumerate(card_map)}
+        candidates = [slug for slug in found if slug in order]
+        if candidates:
+            best = min(candidates, key=lambda slug: (
+                -len(found[slug]["keywords"]), found[slug]["first"], order[slug]
+            ))
+            return card_map[best]
+
+        default = self.defaults.get(bank_slug)
+        if default in card_map:
+            return card_map[default]
+        return next(iter(card_map.values()))
+
+
+_matcher: Optional[CardMatcher] = None
+
+
+def get_card_matcher() -> CardMatcher:
+    """The shared matcher over BANK_CONFIG, built on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = CardMatcher()
+    return _matcher
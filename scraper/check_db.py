@@ -13,18 +13,25 @@ banks = ['akbank', 'garanti', 'yapikredi', 'isbank', 'finansbank']
 total = 0
 
 for bank_slug in banks:
+    # Card maps come from the shared cache: one cards query for all banks
     card_map = db.get_cards_for_bank(bank_slug)
-    bank_total = 0
+    if not card_map:
+        continue
+    result = db.client.table('campaigns').select('card_id, title, merchant_name').in_(
+        'card_id', list(card_map.values())
+    ).eq('is_active', True).execute()
+    by_card = {}
+    for c in result.data:
+        by_card.setdefault(c['card_id'], []).append(c)
 
     for card_slug, card_id in card_map.items():
-        result = db.client.table('campaigns').select('id, title, merchant_name').eq('card_id', card_id).eq('is_active', True).execute()
-        count = len(result.data)
-        bank_total += count
+        campaigns = by_card.get(card_id, [])
+        count = len(campaigns)
         total += count
 
         if count > 0:
             print(f"\n{card_slug.upper()}: {count} kampanya")
-            for i, c in enumerate(result.data[:3], 1):  # Show first 3
+            for i, c in enumerate(campaigns[:3], 1):  # Show first 3
                 print(f"  {i}. {c['title']} - {c['merchant_name']}")
             if count > 3:
                 print(f"  ... ve {count - 3} kampanya daha")
@@ -2,7 +2,30 @@
 Scraper configuration for all banks.
 Contains URLs, card mappings, and CSS selectors.
 """
+import os
 
+# Local state (HTTP cache, snapshots, ...) lives in the repo-level data/ directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# cards: card slug -> keywords (case-insensitive substrings) naming that card
+#             (see card_matcher.py). default_card: card for campaigns that name
+#             none of them (default: the first card).
+# needs_playwright: False = fetch over plain HTTP first, browser only as fallback.
+# http_probe: when needs_playwright is True, still try static HTML first and use
+#             it if campaign_selector matches there (default True).
+# rate_limit: per-host token bucket for every request to the bank's hosts
+#             (see rate_limiter.py; unset keys come from RATE_LIMIT_DEFAULTS).
+# pagination: overrides for the scroll / "load more" driver (PAGINATION_DEFAULTS).
+# extract: ordered extraction strategies for the listing (see extractor.py); the
+#             first one that yields campaigns wins. "extra_listings" adds more
+#             listing pages (e.g. a second site) with their own url/base_url/strategies.
+# vocab: per-bank regex vocabulary for discount and merchant text, merged over
+#             EXTRACT_VOCAB_DEFAULTS.
+# skip_if_unchanged: skip extraction and writes when the listing page's body is
+#             identical to the last fully processed one (server-rendered sites
+#             only); expired campaigns are still deactivated.
+# sweep_min_ratio: override SWEEP_MIN_RATIO for the bank (0 disables the guard,
+#             a value above 1 disables the sweep).
 BANK_CONFIG = {
     "akbank": {
         "name": "Akbank",
@@ -16,8 +39,25 @@ BANK_CONFIG = {
         # Real selectors from axess.com.tr: owl-carousel based layout
         "wait_selector": ".boutiqueWrapper, .owl-carousel, .owl-item",
         "campaign_selector": ".owl-item a[href*='kampanyadetay']",
+        "extract": {
+            "strategies": [
+                {
+                    # Detail links first, then any kampanya link, then owl-item links
+                    "container": ['a[href*="kampanyadetay"]', 'a[href*="kampanya"]', '.owl-item a[href]'],
+                    "fields": {"href": "@href", "title": ["img@alt", "img@title", "", "@title"]},
+                    "require_href": True,
+                    "dedupe": "href",
+                },
+            ],
+        },
+        "vocab": {
+            "percent_units": ["indirim", "kazanç", "bonus", "hediye", "chip-?para"],
+            "amount_units": ["indirim", "kazanç", "hediye", "bonus"],
+        },
         "needs_playwright": True,
-        "request_delay": 3,
+        "detail": {"browser_fallback": True},  # client-rendered like the listing
+        "rate_limit": {"rate": 1.0, "burst": 3, "concurrency": 2},
+        "block_domains": [],  # extra third-party hosts to abort for this bank
         "base_url": "https://www.axess.com.tr",
     },
     "garanti": {
@@ -31,8 +71,33 @@ BANK_CONFIG = {
         },
         "wait_selector": "li a[href*='/kampanyalar/'], h3",
         "campaign_selector": "li a[href*='/kampanyalar/']",
+        "extract": {
+            "strategies": [
+                {
+                    "container": '.campaign-item, .kampanya-item, [class*="campaign"], '
+                                 '[class*="kampanya"], article, .card',
+                    # full_text drives card matching and discount text
+                    "fields": {
+                        "title": 'h1, h2, h3, h4, .title, [class*="title"]',
+                        "full_text": "",
+                        "description": "p, .description",
+                        "href": "a[href]@href",
+                    },
+                },
+            ],
+        },
+        "vocab": {
+            "percent_units": ["indirim", "bonus", "chip", "hediye"],
+            "amount_units": ["indirim", "bonus", "hediye"],
+            "units_required": True,
+            "taksit": False,
+            "merchant_suffixes": ["da", "de", "ta", "te"],
+            "merchant_capitalized": False,
+        },
         "needs_playwright": True,
-        "request_delay": 3,
+        "detail": {"browser_fallback": True},  # client-rendered like the listing
+        "rate_limit": {"rate": 1.0, "burst": 3, "concurrency": 2},
+        "block_domains": [],  # extra third-party hosts to abort for this bank
         "base_url": "https://www.bonus.com.tr",
     },
     "yapikredi": {
@@ -47,8 +112,39 @@ BANK_CONFIG = {
         # Real structure: col-lg-4 grid with picture + p + last-day
         "wait_selector": ".col-lg-4 a[href], .last-day",
         "campaign_selector": ".col-lg-4",
+        "extract": {
+            "strategies": [
+                {
+                    # img alt is the most reliable title, then <p> (PageTitle in template)
+                    "container": ".col-lg-4",
+                    "fields": {
+                        "title": ["img@alt", "img@title", "p"],
+                        "href": "a[href]@href",
+                        "date_text": ".last-day p",
+                    },
+                },
+                {
+                    "container": 'a[href*="/kampanyalar/"]',
+                    "fields": {"title": ["img@alt", ""], "text": "", "href": "@href"},
+                    "min_text_len": 11,
+                    "dedupe": "title",
+                },
+            ],
+        },
+        "vocab": {
+            "amount_units": ["indirim", "kazanç", "hediye", "puan"],
+        },
         "needs_playwright": True,
-        "request_delay": 3,
+        "detail": {"browser_fallback": True},  # client-rendered like the listing
+        # Full list needs "Daha Fazla Göster" clicks, so static HTML is never enough
+        "http_probe": False,
+        "pagination": {"more_selector": 'text="Daha Fazla Göster"'},
+        # Grid is rendered from a JSON feed by Underscore templates (PageTitle etc.)
+        "network_capture": {
+            "url_pattern": r"kampanya|campaign",
+        },
+        "rate_limit": {"rate": 1.0, "burst": 3, "concurrency": 2},
+        "block_domains": [],  # extra third-party hosts to abort for this bank
         "base_url": "https://www.worldcard.com.tr",
     },
     "isbank": {
@@ -62,8 +158,32 @@ BANK_CONFIG = {
         # Real structure: campaign-card div with h3 > a
         "wait_selector": "h3 a[href*='/kampanyalar/']",
         "campaign_selector": "h3 a[href*='/kampanyalar/']",
-        "needs_playwright": True,
-        "request_delay": 3,
+        "extract": {
+            "strategies": [
+                {"jsonld": "OfferCatalog"},
+                {
+                    "container": 'h3 a[href*="/kampanyalar/"]',
+                    "fields": {"title": "", "href": "@href"},
+                    "dedupe": "title",
+                },
+                {
+                    # All kampanya links, minus the CTA buttons
+                    "container": 'a[href*="/kampanyalar/"]',
+                    "fields": {"title": "", "href": "@href"},
+                    "min_text_len": 11,
+                    "exclude_titles": ["Detaylı Bilgi", "Maximum Kart'a Başvur", "Kampanyalar"],
+                    "dedupe": "title",
+                },
+            ],
+        },
+        "vocab": {
+            "amount_units": ["indirim", "kazanç", "hediye", "maxipuan"],
+        },
+        # Server-rendered (JSON-LD + h3 links): plain HTTP first, browser fallback
+        "needs_playwright": False,
+        "skip_if_unchanged": True,
+        "rate_limit": {"rate": 1.0, "burst": 3, "concurrency": 2},
+        "block_domains": [],  # extra third-party hosts to abort for this bank
         "base_url": "https://www.maximum.com.tr",
     },
     "finansbank": {
@@ -78,18 +198,213 @@ BANK_CONFIG = {
         # Real structure: .box-item inside col-lg-4 grid
         "wait_selector": ".box-item",
         "campaign_selector": ".box-item",
+        "extract": {
+            "strategies": [
+                {
+                    "container": ".box-item",
+                    "fields": {
+                        "title": ["img@alt", "img@title", "h1, h2, h3, h4, p", "a"],
+                        "href": "a[href]@href",
+                    },
+                },
+                {
+                    "container": 'a[href*="/kampanyalar/"]',
+                    "fields": {"title": "", "href": "@href"},
+                    "min_text_len": 11,
+                    "dedupe": "title",
+                },
+            ],
+        },
+        "vocab": {
+            "amount_units": ["indirim", "kazanç", "hediye", "parapuan"],
+        },
         "needs_playwright": True,
-        "request_delay": 3,
+        "detail": {"browser_fallback": True},  # client-rendered like the listing
+        # .box-item cards are rendered client-side from a JSON feed
+        "network_capture": {
+            "url_pattern": r"kampanya|campaign",
+        },
+        "rate_limit": {"rate": 1.0, "burst": 3, "concurrency": 2},
+        "block_domains": [],  # extra third-party hosts to abort for this bank
         "base_url": "https://www.qnbcard.com.tr",
     },
 }
 
+# Regex vocabulary for discount/merchant text (per bank override: "vocab").
+# Units are regex fragments matched case-insensitively.
+EXTRACT_VOCAB_DEFAULTS = {
+    "percent_units": ["indirim", "kazanç", "bonus", "hediye"],  # after "%20"
+    "amount_units": ["indirim", "kazanç", "hediye"],            # after "500 TL"
+    "units_required": False,       # only match amounts followed by a unit
+    "taksit": True,                # "6 aya varan taksit" -> "6 taksit"
+    "merchant_suffixes": ["da", "de", "ta", "te", "nda", "nde"],  # "Migros'ta"
+    "merchant_capitalized": True,  # then try the first capitalized phrase
+}
+# Titles shorter than this are navigation, not campaigns
+MIN_TITLE_LENGTH = 5
+
 # Updated Chrome user agent
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 
 # Browser viewport
 VIEWPORT = {"width": 1280, "height": 720}
 
+# Chromium launch flags
+BROWSER_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security'
+]
+
+# Headers sent with every request
+EXTRA_HTTP_HEADERS = {
+    'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+# Request interception: resource types aborted in every context
+# (per bank override: "block_resource_types" in BANK_CONFIG)
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+
+# Third-party analytics/ad hosts aborted for every bank (subdomains included)
+TRACKER_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "criteo.com",
+    "criteo.net",
+    "yandex.ru",
+    "clarity.ms",
+    "adform.net",
+    "tiktok.com",
+    "useinsider.com",
+]
+
+# Typical transfer size per blocked resource type, used to estimate bytes saved
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "other": 20_000,
+}
+
+# HTTP-first fetch path (keep-alive pool shared by all banks)
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE = 10
+
+# Conditional-request cache under both fetch paths
+HTTP_CACHE_PATH = os.path.join(DATA_DIR, "http_cache.db")
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # LRU eviction above this total body size
+# Banks with "skip_if_unchanged" still re-process an unchanged listing after this long
+SKIP_UNCHANGED_MAX_AGE = 24 * 3600  # seconds
+
+# Python-side HTML parser: "auto" (selectolax > lxml > html.parser, whichever
+# is installed) or one of those names
+HTML_PARSER = "auto"
+
+# Compressed, content-addressed page snapshots for offline replay (main.py --replay)
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+# Manifests of older runs are deleted on save, with the objects only they used
+SNAPSHOT_KEEP_RUNS = 30
+
+# Per-host rate limiting (per bank override: "rate_limit" in BANK_CONFIG)
+RATE_LIMIT_DEFAULTS = {
+    "rate": 1.0,        # requests/second, also the ceiling AIMD climbs back to
+    "burst": 2,         # bucket size
+    "concurrency": 2,   # requests in flight per host
+    "min_rate": 0.1,    # floor after repeated 429/503s
+    "increase": 0.1,    # req/s added back per good response
+    "slow_ms": 10000,   # responses slower than this count as backpressure
+}
+
+# Detail-page stage (per bank overrides under "detail" in BANK_CONFIG:
+# selectors, max_pages, browser_fallback, enabled). browser_fallback (default
+# False) re-renders a detail page in Chromium when its static HTML yields
+# nothing; enable it only for banks whose listing needs Playwright. Per-host
+# politeness comes from the rate limiter.
+DETAIL_MAX_CONCURRENCY = 8        # detail pages in flight across all banks
+DETAIL_MAX_PER_BANK = 200
+DETAIL_DEFAULT_SELECTORS = {
+    "description": [
+        ".campaign-detail-text", ".campaign-detail p", ".kampanya-detay p",
+        ".detail-content p", "article p",
+    ],
+    "date_text": [
+        ".last-day", ".campaign-date", ".kampanya-tarihi", "[class*='tarih']",
+    ],
+    "conditions": [
+        ".campaign-conditions", ".kampanya-kosullari", "[class*='condition']",
+        "[class*='kosul']",
+    ],
+}
+
+# Shared browser pool: relaunch Chromium after this many contexts to cap RSS growth
+BROWSER_RECYCLE_AFTER = 20
+
 # Timeouts (milliseconds)
 NAVIGATION_TIMEOUT = 60000  # 60 seconds
 SELECTOR_TIMEOUT = 20000    # 20 seconds
+
+# Page readiness (milliseconds)
+NETWORK_IDLE_MS = 500        # no requests in flight for this long = idle
+DOM_QUIET_MS = 500           # selector count unchanged for this long = settled
+LONG_POLL_MS = 5000          # requests open longer than this don't block idle
+SCROLL_SETTLE_TIMEOUT = 3000  # max wait for new items after a scroll/click
+
+# Listing pagination driver (per bank override: "pagination" in BANK_CONFIG).
+# Scrolls, then clicks more_selector if set, until the item count stops growing.
+PAGINATION_DEFAULTS = {
+    "item_selector": None,     # defaults to the bank's campaign_selector
+    "more_selector": None,     # "load more" button, clicked once scrolling stalls
+    "scroll": True,
+    "stale_rounds": 1,         # steps without growth before the list counts as complete
+    "max_items": 500,
+    "max_steps": 50,
+    "time_budget_ms": 60000,
+}
+
+# Batch normalization (CampaignNormalizer.normalize_batch, renormalize.py)
+NORMALIZE_CHUNK_SIZE = 1000      # campaigns per process-pool task
+NORMALIZE_PARALLEL_MIN = 5000    # smaller batches are normalized in-process
+
+# Memoized text parsing (parse_cache.py). Set PARSE_CACHE_PATH to None to keep
+# the cache in memory only.
+PARSE_CACHE_SIZE = 50_000        # in-memory LRU entries per process
+PARSE_CACHE_PATH = os.path.join(DATA_DIR, "parse_cache.db")
+PARSE_CACHE_MAX_ROWS = 500_000   # disk tier trimmed to this many entries
+
+# Canonical merchants and aliases (merchant_gazetteer.py). Entry keys are the
+# merchant_pattern stored with campaigns.
+MERCHANT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "merchants.json")
+
+# Trigram index over merchant_pattern values (merchant_index.py). Writes only
+# merge exact spellings and gazetteer aliases; scores are for resolve() lookups.
+MERCHANT_RESOLVE_MIN_SCORE = 0.3  # resolve() drops weaker candidates
+
+# Campaigns per bulk upsert request (SupabaseManager.upsert_campaigns)
+UPSERT_CHUNK_SIZE = 200
+# Unchanged campaign ids per last_seen_at update (SupabaseManager.touch_campaigns)
+TOUCH_CHUNK_SIZE = 500
+
+# Mark-and-sweep deactivation: after a complete run, active campaigns the run
+# did not see are deactivated, unless the run saw fewer than this share of the
+# bank's active campaigns (a broken extraction must not empty the table).
+# Per bank: "sweep_min_ratio" in BANK_CONFIG.
+SWEEP_MIN_RATIO = 0.5
+
+# Banks whose writes may wait on the writer (campaign_writer.py) before a
+# finished scraper blocks; bounds the normalized campaigns held in memory.
+WRITE_QUEUE_SIZE = 4
+
+# Shared Supabase client (supabase_client.get_client): connection pool limits
+SUPABASE_MAX_CONNECTIONS = 10
+SUPABASE_MAX_KEEPALIVE = 10
+SUPABASE_TIMEOUT = 120  # seconds, postgrest-py's default request timeout
+
+# All banks' card maps, cached across runs (card_map_cache.py)
+CARD_MAP_CACHE_PATH = os.path.join(DATA_DIR, "card_maps.json")
+CARD_MAP_CACHE_TTL = 24 * 3600   # seconds
@@ -0,0 +1,7 @@
+"""
+pytest setup for the offline unit tests (test_<module>.py next to each module).
+
+test_scraper.py is a manual script against the live Supabase project, not a
+unit test, so it is not collected. Run it directly: python test_scraper.py
+"""
+collect_ignore = ["test_scraper.py"]
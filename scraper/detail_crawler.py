@@ -0,0 +1,134 @@
+"""
+Detail-page crawler.
+
+Listing cards only carry a title and a link, so dates, conditions and the
+real description have to come from each campaign's detail page. This stage
+fetches those pages after listing extraction and fills in the raw dicts.
+
+One crawler is shared by every bank in a run, with a global cap on pages in
+flight; per-host pacing is left to the shared RateLimiter that every fetch
+goes through. Fetching is delegated to the scraper (HTTP first, browser page
+pool as fallback).
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional
+from html_parser import parse
+from config import DETAIL_MAX_CONCURRENCY, DETAIL_MAX_PER_BANK, DETAIL_DEFAULT_SELECTORS
+
+logger = logging.getLogger("scraper.details")
+
+
+def parse_detail(html: str, selectors: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Pull description, date_text and conditions out of a detail page.
+
+    Each field tries its selectors in order and stays empty when none
+    matches. Only campaign-body selectors are used: the meta description and
+    dates elsewhere on the page usually belong to the site, not the campaign.
+    """
+    root = parse(html)
+    root.strip_tags(['script', 'style', 'noscript'])
+
+    def first_text(field: str) -> str:
+        for selector in selectors.get(field, []):
+            elems = root.select(selector)
+            text = ' '.join(e.text(' ') for e in elems).strip()
+            if text:
+                return re.sub(r'\s+', ' ', text)
+        return ''
+
+    return {
+        "description": first_text('description'),
+        "date_text": first_text('date_text'),
+        "conditions": first_text('conditions'),
+    }
+
+
+class DetailCrawler:
+    """Bounded scheduler for detail page fetches."""
+
+    def __init__(self, max_concurrency: int = DETAIL_MAX_CONCURRENCY):
+        self._global = asyncio.Semaphore(max_concurrency)
+        self.fetched = 0
+        self.failed = 0
+
+    async def crawl(self, scraper, campaigns: List[Dict[str, Any]]) -> int:
+        """
+        Fetch detail pages for `campaigns` (raw dicts from extract_campaigns)
+        and fill in description/date_text/conditions in place.
+        Returns the number of campaigns enriched.
+        """
+        detail_config = scraper.config.get("detail", {})
+        listing_url = scraper.config["urls"]["campaigns"]
+        selectors = {**DETAIL_DEFAULT_SELECTORS, **detail_config.get("selectors", {})}
+        max_pages = detail_config.get("max_pages", DETAIL_MAX_PER_BANK)
+
+        # Several cards can share one detail page: fetch each URL once
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for campaign in campaigns:
+            url = campaign.get("source_url")
+            if url and url.startswith('http') and url.rstrip('/') != listing_url.rstrip('/'):
+                by_url.setdefault(url, []).append(campaign)
+        urls = list(by_url)[:max_pages]
+        if not urls:
+            return 0
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(
+            self._fetch_one(scraper, url, selectors,
+                            detail_config.get("browser_fallback", False))
+            for url in urls
+        ))
+
+        enriched = 0
+        for url, fields in zip(urls, results):
+            if not fields:
+                continue
+            for campaign in by_url[url]:
+                if self._merge(campaign, fields):
+                    enriched += 1
+
+        scraper.logger.info(
+            f"Detail pages: {sum(1 for r in results if r)}/{len(urls)} parsed, "
+            f"{enriched} campaigns enriched in {time.monotonic() - start:.1f}s"
+        )
+        return enriched
+
+    async def _fetch_one(self, scraper, url: str, selectors: Dict[str, List[str]],
+                         browser_fallback: bool) -> Optional[Dict[str, str]]:
+        """
+        Fetch and parse one detail page: plain HTTP first, then (with
+        browser_fallback) a browser page if the static HTML yielded nothing.
+        """
+        fields = None
+        async with self._global:
+            for use_browser in ((False, True) if browser_fallback else (False,)):
+                try:
+                    html = await scraper.fetch_detail(url, use_browser=use_browser)
+                    fields = parse_detail(html, selectors) if html else None
+                except Exception as e:
+                    scraper.logger.warning(f"Detail page failed for {url}: {e}")
+                    fields = None
+                if fields and any(fields.values()):
+                    break
+        if fields and any(fields.values()):
+            self.fetched += 1
+            return fields
+        self.failed += 1
+        return None
+
+    @staticmethod
+    def _merge(campaign: Dict[str, Any], fields: Dict[str, str]) -> bool:
+        """Fill empty fields; a longer description replaces the title copy."""
+        changed = False
+        if len(fields["description"]) > len(campaign.get("description") or ""):
+            campaign["description"] = fields["description"]
+            changed = True
+        for key in ("date_text", "conditions"):
+            if fields[key] and not campaign.get(key):
+                campaign[key] = fields[key]
+                changed = True
+        return changed
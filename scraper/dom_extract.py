@@ -0,0 +1,113 @@
+"""
+Declarative item extraction, run inside the page or on static HTML.
+
+A bank describes its listing as a container selector plus one spec per
+field, and gets back a list of plain dicts:
+
+    container = ".col-lg-4"                   # or a list: first that matches wins
+    fields = {
+        "title": ["img@alt", "img@title", "p"],  # alternatives, first non-empty wins
+        "href": "a[href]@href",                   # selector@attribute
+        "date_text": ".last-day p",               # selector alone = its text
+        "link_text": "",                          # "" = the container's own text
+    }
+
+On the browser path ITEM_EXTRACT_JS computes the dicts in Chromium with one
+page.evaluate() call, so neither the serialized DOM nor a Python-side parse
+is needed. extract_from_html() applies the same spec to static/replayed
+HTML through html_parser, building only the container elements where the
+backend allows it; text is collected like get_text(strip=True) in both.
+"""
+import re
+from typing import Dict, List, Union
+from html_parser import parse
+
+FieldSpec = Union[str, List[str]]
+
+_ATTR = re.compile(r'^[\w:-]+$')
+
+ITEM_EXTRACT_JS = """
+([containers, fields]) => {
+    const text = (el) => {
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            const t = node.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        return parts.join('');
+    };
+    let nodes = [];
+    for (const selector of containers) {
+        nodes = Array.from(document.querySelectorAll(selector));
+        if (nodes.length) break;
+    }
+    return nodes.map(node => {
+        const item = {};
+        for (const [name, alternatives] of Object.entries(fields)) {
+            let value = '';
+            for (const [selector, attr] of alternatives) {
+                const el = selector ? node.querySelector(selector) : node;
+                if (!el) continue;
+                value = attr ? (el.getAttribute(attr) || '') : text(el);
+                if (value) break;
+            }
+            item[name] = value;
+        }
+        return item;
+    });
+}
+"""
+
+
+def compile_fields(fields: Dict[str, FieldSpec]) -> Dict[str, List[List[str]]]:
+    """
+    Turn "selector@attr" strings into [selector, attr] pairs ("" = none).
+    Already compiled pairs are passed through, so specs can be compiled once.
+    """
+    compiled = {}
+    for name, spec in fields.items():
+        alternatives = [spec] if isinstance(spec, str) else spec
+        pairs = []
+        for alt in alternatives:
+            if not isinstance(alt, str):
+                pairs.append(list(alt))
+                continue
+            selector, sep, attr = alt.rpartition('@')
+            if not sep or not _ATTR.match(attr):
+                selector, attr = alt, ""
+            pairs.append([selector.strip(), attr])
+        compiled[name] = pairs
+    return compiled
+
+
+def containers_list(container: Union[str, List[str]]) -> List[str]:
+    return [container] if isinstance(container, str) else list(container)
+
+
+def extract_from_html(html: str, container: Union[str, List[str]],
+                      fields: Dict[str, FieldSpec]) -> List[Dict[str, str]]:
+    """Same result as ITEM_EXTRACT_JS, computed from an HTML string."""
+    compiled = compile_fields(fields)
+    nodes = []
+    for selector in containers_list(container):
+        nodes = parse(html, scope=selector).select(selector)
+        if nodes:
+            break
+
+    items = []
+    for node in nodes:
+        item = {}
+        for name, alternatives in compiled.items():
+            value = ''
+            for selector, attr in alternatives:
+                el = node.select_one(selector) if selector else node
+                if el is None:
+                    continue
+                value = el.attr(attr) if attr else el.text()
+                if value:
+                    break
+            item[name] = value
+        items.append(item)
+    return items
@@ -0,0 +1,242 @@
+"""
+Spec-driven campaign extraction.
+
+Each bank declares its listing extraction in BANK_CONFIG instead of Python:
+
+    "extract": {
+        "strategies": [                       # tried in order, first with results wins
+            {
+                "container": ".box-item",     # or a list of fallbacks
+                "fields": {"title": ["img@alt", "p"], "href": "a[href]@href"},
+                "min_text_len": 11,           # optional filter on "text" (or title)
+                "exclude_titles": [...],      # optional
+                "require_href": True,         # optional, skip items without a link
+                "dedupe": "title",            # optional: "title" or "href"
+            },
+            {"jsonld": "OfferCatalog"},       # schema.org JSON-LD in the page
+        ],
+        "extra_listings": [{"url": ..., "base_url": ..., "strategies": [...]}],
+    },
+    "vocab": {"amount_units": ["indirim", "parapuan"], ...},
+
+Fields are dom_extract specs; besides title and href, an item may carry
+description, date_text, text (used by min_text_len) and full_text (used
+for card matching and discount text instead of the title).
+
+BankExtractor compiles the field specs and vocabulary regexes once per bank
+(get_extractor caches them), so nothing is compiled per item; cards are
+matched by the shared card_matcher automaton.
+"""
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, Any, List
+from dom_extract import compile_fields, containers_list
+from card_matcher import get_card_matcher
+from config import EXTRACT_VOCAB_DEFAULTS, MIN_TITLE_LENGTH
+
+logger = logging.getLogger("scraper.extractor")
+
+JSONLD_CONTAINER = 'script[type="application/ld+json"]'
+_JSONLD_FIELDS = compile_fields({"json": ""})
+_CAPITALIZED = re.compile(r'([A-ZĞÜŞÖÇİ][a-zğüşöçı]+(?:\s+[A-ZĞÜŞÖÇİ][a-zğüşöçı]+)*)')
+
+
+class Vocab:
+    """Compiled discount/merchant regexes for one bank."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        spec = {**EXTRACT_VOCAB_DEFAULTS, **spec}
+        optional = '' if spec["units_required"] else '?'
+        self.percent_re = re.compile(
+            rf'%\d+[\s,]*(?:{"|".join(spec["percent_units"])}){optional}', re.IGNORECASE
+        )
+        self.amount_re = re.compile(
+            rf"[\d.]+\s*TL'?(?:ye|ye\s+varan)?\s*(?:{'|'.join(spec['amount_units'])}){optional}",
+            re.IGNORECASE
+        )
+        self.taksit_re = (
+            re.compile(r'(\d+)\s*(?:aya?\s*(?:kadar|varan)\s*)?taksit', re.IGNORECASE)
+            if spec["taksit"] else None
+        )
+        self.merchant_re = re.compile(
+            rf"([\w\s&.]+?)['’]?(?:{'|'.join(spec['merchant_suffixes'])})\s", re.IGNORECASE
+        )
+        self.capitalized = spec["merchant_capitalized"]
+
+    def merchant(self, title_text: str) -> str:
+        match = self.merchant_re.search(title_text)
+        if match:
+            return match.group(1).strip()
+        if self.capitalized:
+            match = _CAPITALIZED.search(title_text)
+            if match:
+                return match.group(1).strip()
+        for w in title_text.split():
+            if len(w) > 2 and not w.startswith('%'):
+                return w
+        return "Bilinmeyen"
+
+    def discount_text(self, text: str) -> str:
+        match = self.percent_re.search(text) or self.amount_re.search(text)
+        if match:
+            return match.group(0).strip()
+        if self.taksit_re:
+            match = self.taksit_re.search(text)
+            if match:
+                return f"{match.group(1)} taksit"
+        return text[:100]
+
+
+class Strategy:
+    """One compiled extraction strategy."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.jsonld = spec.get("jsonld")
+        if self.jsonld:
+            self.container = [JSONLD_CONTAINER]
+            self.fields = _JSONLD_FIELDS
+        else:
+            self.container = containers_list(spec["container"])
+            self.fields = compile_fields(spec["fields"])
+        self.min_text_len = spec.get("min_text_len", 0)
+        self.exclude_titles = set(spec.get("exclude_titles", []))
+        self.require_href = spec.get("require_href", False)
+        self.dedupe = spec.get("dedupe")
+        self.label = self.jsonld and f"JSON-LD {self.jsonld}" or self.container[0]
+
+    def items(self, raw_items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Filtered, deduplicated items with a title."""
+        if self.jsonld:
+            raw_items = self._jsonld_items(raw_items)
+        items = []
+        seen = set()
+        for item in raw_items:
+            title = item.get("title", "")
+            text = item.get("text", title)
+            href = item.get("href", "")
+            if len(title) < MIN_TITLE_LENGTH or len(text) < self.min_text_len:
+                continue
+            if title in self.exclude_titles or text in self.exclude_titles:
+                continue
+            if self.require_href and (not href or href == '#'):
+                continue
+            if self.dedupe:
+                key = item.get(self.dedupe, "")
+                if key in seen:
+                    continue
+                seen.add(key)
+            items.append(item)
+        return items
+
+    def _jsonld_items(self, scripts: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        items = []
+        for script in scripts:
+            try:
+                data = json.loads(script["json"])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(data, dict) and data.get('@type') == self.jsonld:
+                for entry in data.get('itemListElement', []):
+                    if not isinstance(entry, dict):
+                        continue
+                    items.append({
+                        "title": entry.get('name', '') or entry.get('description', ''),
+                        "href": entry.get('url', ''),
+                    })
+        return items
+
+
+class BankExtractor:
+    """Runs a bank's compiled strategies against its listing page(s)."""
+
+    def __init__(self, bank_slug: str, config: Dict[str, Any]):
+        self.bank_slug = bank_slug
+        self.card_matcher = get_card_matcher()
+        spec = config.get("extract", {})
+        base_url = config.get("base_url", "")
+        strategies = [Strategy(s) for s in spec.get("strategies", [])]
+        self.listings = [{
+            "url": config["urls"]["campaigns"],
+            "base_url": base_url,
+            "strategies": strategies,
+        }]
+        for extra in spec.get("extra_listings", []):
+            self.listings.append({
+                "url": extra["url"],
+                "base_url": extra.get("base_url", base_url),
+                "strategies": [Strategy(s) for s in extra["strategies"]] if "strategies" in extra else strategies,
+            })
+        self.vocab = Vocab(config.get("vocab", {}))
+        # Identifies the vocabulary in parse cache keys (see BaseScraper._extract_merchant).
+        # Hashes the merged spec, so editing EXTRACT_VOCAB_DEFAULTS changes it too.
+        merged_vocab = {**EXTRACT_VOCAB_DEFAULTS, **config.get("vocab", {})}
+        self.vocab_key = hashlib.sha1(
+            json.dumps(merged_vocab, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def match_card(self, text: str, card_map: Dict[str, int]) -> int:
+        return self.card_matcher.match(text, card_map, self.bank_slug)
+
+    async def extract(self, scraper, card_map: Dict[str, int]) -> List[Dict[str, Any]]:
+        campaigns = []
+        for listing in self.listings:
+            url = listing["url"]
+            try:
+                campaigns.extend(await self._extract_listing(scraper, listing, card_map))
+            except Exception as e:
+                scraper.logger.error(f"Failed to extract campaigns from {url}: {e}")
+                scraper.errors.append(f"Extraction failed: {str(e)}")
+        return campaigns
+
+    async def _extract_listing(self, scraper, listing: Dict[str, Any],
+                               card_map: Dict[str, int]) -> List[Dict[str, Any]]:
+        url = listing["url"]
+        html = await scraper.open_listing(url)
+        if html is None:
+            # Rendered in the browser: prefer the JSON feed over the DOM
+            captured = await scraper.captured_campaigns(card_map, url)
+            if captured:
+                return captured
+
+        for number, strategy in enumerate(listing["strategies"], 1):
+            raw_items = await scraper.extract_items(strategy.container, strategy.fields, html)
+            items = strategy.items(raw_items)
+            scraper.logger.info(f"Strategy {number} ({strategy.label}): {len(items)}/{len(raw_items)}")
+            if items:
+                return [self.campaign(scraper, item, card_map, url, listing["base_url"]) for item in items]
+        return []
+
+    def campaign(self, scraper, item: Dict[str, str], card_map: Dict[str, int],
+                 listing_url: str, base_url: str) -> Dict[str, Any]:
+        """Raw campaign dict (see BaseScraper.extract_campaigns) from one item."""
+        title = item["title"]
+        full_text = item.get("full_text") or title
+        description = item.get("description") or (full_text[:200] if "full_text" in item else title)
+
+        source_url = item.get("href", "")
+        if source_url and not source_url.startswith('http'):
+            source_url = f"{base_url}{source_url}"
+
+        return {
+            "card_id": self.match_card(full_text, card_map),
+            "title": title[:200],
+            "description": description[:500],
+            "merchant_name": scraper._extract_merchant(title),
+            "discount_text": self.vocab.discount_text(full_text),
+            "conditions": "",
+            "source_url": source_url or listing_url,
+            "date_text": item.get("date_text", ""),
+        }
+
+
+_EXTRACTORS: Dict[str, BankExtractor] = {}
+
+
+def get_extractor(bank_slug: str, config: Dict[str, Any]) -> BankExtractor:
+    """Compiled extractor for a bank, built once per process."""
+    extractor = _EXTRACTORS.get(bank_slug)
+    if extractor is None:
+        extractor = _EXTRACTORS[bank_slug] = BankExtractor(bank_slug, config)
+    return extractor
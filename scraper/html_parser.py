@@ -0,0 +1,178 @@
+"""
+Pluggable HTML parser backend.
+
+Every Python-side HTML parse (static listings, replayed pages, detail pages)
+goes through parse(), which picks the fastest backend installed:
+
+- selectolax: lexbor/modest C parser, CSS queries run on the native tree
+- lxml: BeautifulSoup on the lxml tree builder
+- html.parser: BeautifulSoup's pure-Python fallback
+
+HTML_PARSER in config.py forces one ("auto" picks in the order above).
+
+parse(html, scope=selector) builds only the elements matching `selector`
+(and their subtrees) on the BeautifulSoup backends, through a SoupStrainer.
+Only simple compound selectors can be strained (`.box-item`, `div.col-lg-4`,
+`a[href*="kampanya"]`); anything else parses the whole page. selectolax
+always builds the full native tree, which is cheap, and queries the subtree.
+
+Nodes from all backends expose the same small API: select(), select_one(),
+attr(), text() and tag. text() joins stripped text nodes like BeautifulSoup's
+get_text(strip=True).
+"""
+import importlib.util
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from config import HTML_PARSER
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:  # optional: older selectolax without lexbor, or not installed
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser
+    except ImportError:
+        _SelectolaxParser = None
+
+# lxml is only used through BeautifulSoup's "lxml" builder: probe, don't import
+_HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+logger = logging.getLogger("scraper.html_parser")
+
+# tag? (.class)? ([attr] | [attr op "value"])*
+_COMPOUND = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<cls>\.[\w-]+)?(?P<attrs>(?:\[[^\]]+\])*)$')
+_ATTR_SELECTOR = re.compile(r'\[\s*([\w:-]+)\s*(?:([*^$]?=)\s*["\']?(.*?)["\']?\s*)?\]')
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if _SelectolaxParser is not None:
+        backends.append("selectolax")
+    if _HAS_LXML:
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def default_backend() -> str:
+    available = available_backends()
+    if HTML_PARSER != "auto":
+        if HTML_PARSER in available:
+            return HTML_PARSER
+        logger.warning(f"HTML_PARSER {HTML_PARSER!r} not installed, using {available[0]}")
+    return available[0]
+
+
+BACKEND = default_backend()
+
+
+@lru_cache(maxsize=128)
+def strainer_for(selector: str) -> Optional[SoupStrainer]:
+    """SoupStrainer equivalent of a simple compound selector, else None."""
+    match = _COMPOUND.match(selector.strip())
+    if not match or not (match.group('tag') or match.group('cls') or match.group('attrs')):
+        return None
+
+    attrs: Dict[str, Any] = {}
+    if match.group('cls'):
+        # Matched against the raw attribute value while parsing, so as a word
+        attrs['class'] = re.compile(r'(?:^|\s)' + re.escape(match.group('cls')[1:]) + r'(?:\s|$)')
+    for name, op, value in _ATTR_SELECTOR.findall(match.group('attrs') or ''):
+        if name in attrs:
+            return None
+        if not op:
+            attrs[name] = True
+        elif op == '=':
+            attrs[name] = value
+        elif op == '*=':
+            attrs[name] = re.compile(re.escape(value))
+        elif op == '^=':
+            attrs[name] = re.compile('^' + re.escape(value))
+        else:
+            attrs[name] = re.compile(re.escape(value) + '$')
+    return SoupStrainer(match.group('tag'), attrs=attrs)
+
+
+class SoupNode:
+    """BeautifulSoup element (html.parser or lxml tree builder)."""
+
+    __slots__ = ('el',)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def tag(self) -> str:
+        return self.el.name or ''
+
+    def select(self, selector: str) -> List["SoupNode"]:
+        return [SoupNode(el) for el in self.el.select(selector)]
+
+    def select_one(self, selector: str) -> Optional["SoupNode"]:
+        el = self.el.select_one(selector)
+        return SoupNode(el) if el is not None else None
+
+    def attr(self, name: str) -> str:
+        value = self.el.get(name) or ''
+        if isinstance(value, list):  # class and other multi-valued attributes
+            value = ' '.join(value)
+        return value
+
+    def text(self, separator: str = '') -> str:
+        if self.el.name in ('script', 'style'):
+            # bs4 leaves script/style contents out of get_text()
+            return (self.el.string or '').strip()
+        return self.el.get_text(separator, strip=True)
+
+    def strip_tags(self, tags: List[str]):
+        for el in self.el(tags):
+            el.decompose()
+
+
+class SelectolaxNode:
+    """selectolax node."""
+
+    __slots__ = ('el',)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def tag(self) -> str:
+        return self.el.tag or ''
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(el) for el in self.el.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        el = self.el.css_first(selector)
+        return SelectolaxNode(el) if el is not None else None
+
+    def attr(self, name: str) -> str:
+        return self.el.attributes.get(name) or ''
+
+    def text(self, separator: str = '') -> str:
+        return self.el.text(deep=True, separator=separator, strip=True)
+
+    def strip_tags(self, tags: List[str]):
+        for tag in tags:
+            for el in self.el.css(tag):
+                el.decompose()
+
+
+def parse(html: str, scope: Optional[str] = None, backend: Optional[str] = None):
+    """
+    Parse HTML and return its root node.
+
+    `scope` is a hint: on BeautifulSoup backends, a strainable selector means
+    only matching elements are built. Callers must still select() the scope
+    themselves, and must not rely on anything outside it.
+    """
+    backend = backend or BACKEND
+    if backend == "selectolax":
+        return SelectolaxNode(_SelectolaxParser(html or "<html></html>").root)
+    strainer = strainer_for(scope) if scope else None
+    features = 'lxml' if backend == "lxml" else 'html.parser'
+    return SoupNode(BeautifulSoup(html, features, parse_only=strainer))
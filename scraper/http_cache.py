@@ -0,0 +1,229 @@
+"""
+Persistent conditional-request HTTP cache.
+
+Pages are stored in SQLite (data/http_cache.db) together with their ETag
+and Last-Modified validators. The next fetch sends If-None-Match /
+If-Modified-Since; a 304 is answered from the stored body. The cache sits
+under both fetch paths:
+- HttpFetcher asks it for validators and stores 200 responses
+- attach() installs a Playwright route that does the same for documents
+  and JSON feeds the browser loads from the bank's own hosts
+Only responses with a validator (ETag or Last-Modified) and without
+Cache-Control: no-store are stored; anything else could never be
+revalidated, or must not be kept.
+
+It also remembers which version of a page was last fully processed, so a
+scraper can cheaply ask "did this page change?" and skip the rest of the run.
+Entries are evicted least-recently-used once the total body size exceeds
+the budget.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+from urllib.parse import urlsplit
+from playwright.async_api import BrowserContext, Route
+from config import HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES
+
+logger = logging.getLogger("scraper.http_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    body_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+CREATE TABLE IF NOT EXISTS processed (
+    url TEXT PRIMARY KEY,
+    body_hash TEXT NOT NULL,
+    processed_at REAL NOT NULL
+);
+"""
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def cacheable(headers: Dict[str, str]) -> bool:
+    """True if a 200 response can be revalidated later and may be stored."""
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if 'no-store' in lowered.get('cache-control', '').lower():
+        return False
+    return bool(lowered.get('etag') or lowered.get('last-modified'))
+
+
+def host_matches(url: str, hosts: Iterable[str]) -> bool:
+    """True if url's host is one of hosts or a subdomain of one."""
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+class HttpCache:
+    """SQLite-backed store of HTTP bodies and their validators."""
+
+    # Only idempotent loads whose bodies we actually read are cached in the browser
+    ROUTED_RESOURCE_TYPES = {"document", "xhr", "fetch"}
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached URL."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a URL (after a 304), marking it recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, content_type, body_hash FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+        self.hits += 1
+        return {"body": row[0], "content_type": row[1], "body_hash": row[2]}
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> str:
+        """Store a 200 response if it is cacheable(); returns its body hash."""
+        # Header lookups are case-insensitive in httpx but not in plain dicts
+        lowered = {k.lower(): v for k, v in headers.items()}
+        digest = body_hash(body)
+        now = time.time()
+        self.misses += 1
+        if not cacheable(lowered):
+            return digest
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, etag, last_modified, content_type, body, body_hash, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, lowered.get('etag'), lowered.get('last-modified'),
+                 lowered.get('content-type'), body, digest, len(body), now, now)
+            )
+            self._conn.commit()
+            self._evict()
+        return digest
+
+    def _evict(self):
+        """Drop least-recently-used entries until under ~90% of the size budget."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            evicted += 1
+        self._conn.commit()
+        logger.info(f"Evicted {evicted} cache entries (now {total // 1024} KB)")
+
+    def is_processed(self, url: str, digest: str, max_age: float) -> bool:
+        """True if this exact body was fully processed less than max_age seconds ago."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body_hash, processed_at FROM processed WHERE url = ?", (url,)
+            ).fetchone()
+        return bool(row) and row[0] == digest and time.time() - row[1] < max_age
+
+    def mark_processed(self, url: str, digest: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed (url, body_hash, processed_at) VALUES (?, ?, ?)",
+                (url, digest, time.time())
+            )
+            self._conn.commit()
+
+    async def attach(self, context: BrowserContext, hosts: Iterable[str]):
+        """
+        Serve browser document/XHR loads from hosts (and their subdomains)
+        through the cache. Attach before ResourceBlocker: routes run last
+        registered first, so blocked requests never reach the cache.
+        """
+        hosts = tuple(h.lower() for h in hosts)
+        await context.route("**/*", lambda route: self._handle(route, hosts))
+
+    async def _handle(self, route: Route, hosts: Iterable[str]):
+        request = route.request
+        if (request.method != "GET" or request.resource_type not in self.ROUTED_RESOURCE_TYPES
+                or not host_matches(request.url, hosts)):
+            await route.fallback()
+            return
+
+        # SQLite work (including commits) runs in a thread, off the event loop
+        conditional = await asyncio.to_thread(self.conditional_headers, request.url)
+        try:
+            response = await route.fetch(headers={**request.headers, **conditional})
+        except Exception as e:
+            logger.debug(f"Cache route fetch failed for {request.url}: {e}")
+            await route.fallback()
+            return
+
+        if response.url != request.url:
+            # Redirected: let the browser follow it so the page gets the right URL
+            await route.fallback()
+            return
+
+        if response.status == 304 and conditional:
+            cached = await asyncio.to_thread(self.lookup, request.url)
+            if cached:
+                headers = {'content-type': cached["content_type"]} if cached["content_type"] else {}
+                await route.fulfill(status=200, headers=headers, body=cached["body"])
+                return
+            # Evicted between the header lookup and now: fetch unconditionally
+            await route.fallback()
+            return
+
+        body = await response.body()
+        if response.status == 200:
+            await asyncio.to_thread(self.store, request.url, response.headers, body)
+        # body() is already decoded, so the encoding/length headers no longer apply
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in ('content-encoding', 'content-length')}
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    def stats(self) -> Dict[str, int]:
+        """hits = 304s served from cache, misses = full bodies downloaded."""
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,133 @@
+"""
+Lightweight HTTP fetcher for pages that don't need a browser.
+
+A single pooled keep-alive client sends the same user agent and language
+headers as the Playwright contexts. gzip/deflate are always accepted;
+brotli is advertised and decoded when the `brotli` package is installed.
+With an HttpCache, requests are conditional and 304s are served from disk;
+with a RateLimiter, every request waits for its host's token and reports
+its status and latency back.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+import httpx
+from http_cache import HttpCache, body_hash
+from rate_limiter import RateLimiter
+from config import (
+    USER_AGENT, EXTRA_HTTP_HEADERS, NAVIGATION_TIMEOUT,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE
+)
+
+logger = logging.getLogger("scraper.http")
+
+
+def _charset(content_type: Optional[str]) -> str:
+    """Charset from a Content-Type header, utf-8 if absent."""
+    for part in (content_type or "").split(';')[1:]:
+        key, _, value = part.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"')
+    return 'utf-8'
+
+
+class HttpFetcher:
+    """Pooled async HTTP client shared by all scrapers in a run."""
+
+    def __init__(self, cache: Optional[HttpCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.client = httpx.AsyncClient(
+            headers={
+                'User-Agent': USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                **EXTRA_HTTP_HEADERS,
+            },
+            follow_redirects=True,
+            timeout=httpx.Timeout(NAVIGATION_TIMEOUT / 1000),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+        )
+        self.requests = 0
+        self.bytes_received = 0
+
+    async def __aenter__(self) -> "HttpFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        GET a page, conditionally if it is in the cache.
+
+        Returns {"url", "status", "html", "body_hash", "not_modified",
+        "elapsed_ms"} for any response, or None if the request itself failed
+        (DNS, TLS, timeout...). A 304 comes back with status 200, the cached
+        body and not_modified True.
+        """
+        conditional = await asyncio.to_thread(self.cache.conditional_headers, url) if self.cache else {}
+        response = await self._get(url, conditional)
+        if response is None:
+            return None
+        elapsed_ms = int(response.elapsed.total_seconds() * 1000)
+
+        if response.status_code == 304 and conditional:
+            cached = await asyncio.to_thread(self.cache.lookup, url)
+            if cached:
+                return {
+                    "url": str(response.url),
+                    "status": 200,
+                    "html": cached["body"].decode(_charset(cached["content_type"]), errors='replace'),
+                    "body_hash": cached["body_hash"],
+                    "not_modified": True,
+                    "elapsed_ms": elapsed_ms,
+                }
+            # Evicted since the headers were built: fetch it again in full
+            response = await self._get(url, {})
+            if response is None:
+                return None
+
+        self.bytes_received += len(response.content)
+        if response.status_code == 200 and self.cache:
+            digest = await asyncio.to_thread(self.cache.store, url, response.headers, response.content)
+        else:
+            digest = body_hash(response.content)
+        return {
+            "url": str(response.url),
+            "status": response.status_code,
+            "html": response.text,
+            "body_hash": digest,
+            "not_modified": False,
+            "elapsed_ms": elapsed_ms,
+        }
+
+    async def _get(self, url: str, headers: Dict[str, str]) -> Optional[httpx.Response]:
+        """One GET, paced by the host's rate limiter; None on transport errors."""
+        if self.rate_limiter is None:
+            return await self._send(url, headers)
+        async with self.rate_limiter.alimit(url):
+            start = time.monotonic()
+            response = await self._send(url, headers)
+            if response is None:
+                self.rate_limiter.record(url, None, time.monotonic() - start)
+            else:
+                self.rate_limiter.record(url, response.status_code, time.monotonic() - start,
+                                         response.headers.get('retry-after'))
+            return response
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> Optional[httpx.Response]:
+        try:
+            response = await self.client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+        self.requests += 1
+        return response
+
+    async def close(self):
+        await self.client.aclose()
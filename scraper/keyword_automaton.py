@@ -0,0 +1,88 @@
+"""
+Aho-Corasick keyword automaton shared by the card matcher and the merchant
+gazetteer.
+
+KeywordAutomaton finds every occurrence of every keyword in one pass over
+the text. It uses pyahocorasick when installed; otherwise a pure-Python
+goto/fail automaton. Keywords and text should both go through fold():
+lowercase, with the Turkish I/İ/ı all folded to "i".
+"""
+from collections import deque
+from typing import Dict, Any, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional: pure-Python automaton below
+    ahocorasick = None
+
+
+def fold(text: str) -> str:
+    text = text.lower()
+    if text.isascii():
+        return text
+    # str.lower() turns İ into "i" + combining dot above
+    return text.replace('i̇', 'i').replace('ı', 'i')
+
+
+class _PyAutomaton:
+    """Pure-Python Aho-Corasick: goto/fail tables over keyword characters."""
+
+    def __init__(self, keywords: Dict[str, Any]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[str, Any]]] = [[]]
+        for keyword, value in keywords.items():
+            state = 0
+            for ch in keyword:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((keyword, value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Tuple[str, Any]]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for hit in out[state]:
+                yield i, hit
+
+
+class KeywordAutomaton:
+    """Folded keyword -> value, searchable in one pass."""
+
+    def __init__(self, keywords: Dict[str, Any]):
+        self.size = len(keywords)
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, value in keywords.items():
+                self._automaton.add_word(keyword, (keyword, value))
+            if keywords:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = _PyAutomaton(keywords)
+
+    def iter(self, folded: str) -> Iterator[Tuple[int, str, Any]]:
+        """(start index, keyword, value) for every keyword occurrence in folded text."""
+        if not self.size or not folded:
+            return
+        for end, (keyword, value) in self._automaton.iter(folded):
+            yield end - len(keyword) + 1, keyword, value
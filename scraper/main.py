@@ -6,16 +6,32 @@ Usage:
     python main.py                    # Run all banks
     python main.py --banks akbank     # Run only Akbank
     python main.py --banks akbank garanti  # Run Akbank and Garanti
+    python main.py --concurrency 5    # Scrape all banks in parallel
+    python main.py --replay 20260213_153001  # Re-extract a stored run offline
+    python main.py --refresh-cards    # Ignore the cached card maps
 """
 import sys
+import asyncio
 import logging
 import argparse
+import json
 from datetime import datetime
-from banks.akbank import AkbankScraper
-from banks.garanti import GarantiScraper
-from banks.yapikredi import YapikrediScraper
-from banks.isbank import IsbankScraper
-from banks.finansbank import FinansbankScraper
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher
+from http_cache import HttpCache
+from snapshot_store import SnapshotStore, ReplaySource
+from detail_crawler import DetailCrawler
+from rate_limiter import RateLimiter
+from parse_cache import ParseCache
+from merchant_index import MerchantIndex
+from campaign_writer import CampaignWriter
+from card_map_cache import get_card_map_cache
+from normalizer import NORMALIZER_VERSION
+from banks import scraper_for
+from config import BANK_CONFIG, PARSE_CACHE_PATH
+
+# Identifies this run's log file and snapshot manifest
+RUN_ID = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 # Configure logging
 logging.basicConfig(
@@ -23,51 +39,152 @@ logging.basicConfig(
     format='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(f'scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+        logging.FileHandler(f'scraper_{RUN_ID}.log')
     ]
 )
 logger = logging.getLogger("scraper.main")
 
-SCRAPERS = {
-    "akbank": AkbankScraper,
-    "garanti": GarantiScraper,
-    "yapikredi": YapikrediScraper,
-    "isbank": IsbankScraper,
-    "finansbank": FinansbankScraper,
-}
+# Every bank in BANK_CONFIG, including ones defined only there
+SCRAPERS = {bank_slug: scraper_for(bank_slug) for bank_slug in BANK_CONFIG}
+
+
+def _failed_summary(bank_slug: str, error: Exception) -> dict:
+    return {
+        "bank": bank_slug,
+        "scraped": 0,
+        "saved": 0,
+        "errors": 1,
+        "error_details": [str(error)],
+        "elapsed_seconds": 0,
+    }
+
+
+async def _run_scrapers(scrapers_to_run, concurrency: int):
+    """
+    Run scrapers on one event loop, at most `concurrency` banks at a time.
+
+    Results come back in the same order as `scrapers_to_run`, whatever order
+    the banks finish in.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    # One Chromium, one keep-alive HTTP pool and one on-disk HTTP cache for
+    # the whole run; each bank gets its own browser context only if it needs one
+    http_cache = HttpCache()
+    snapshot_store = SnapshotStore(RUN_ID)
+    # Shared so the global/per-host detail page limits hold across banks
+    detail_crawler = DetailCrawler()
+    # One limiter per run: listing, detail and HTTP fetches share each host's budget
+    rate_limiter = RateLimiter()
+    # Discount/date/merchant strings repeat across banks and runs
+    parse_cache = ParseCache(NORMALIZER_VERSION, path=PARSE_CACHE_PATH)
+    # Canonical merchant patterns, shared so every bank writes the same keys
+    merchant_index = MerchantIndex()
+    # Database writes run on one writer task, overlapping the next banks' scraping
+    async with BrowserPool() as browser_pool, \
+            HttpFetcher(cache=http_cache, rate_limiter=rate_limiter) as http_fetcher, \
+            CampaignWriter() as writer:
+
+        async def run_one(bank_slug, ScraperClass):
+            async with semaphore:
+                logger.info(f"\n{'='*80}")
+                logger.info(f"Running {bank_slug.upper()} scraper...")
+                logger.info(f"{'='*80}")
+                try:
+                    scraper = ScraperClass(
+                        browser_pool=browser_pool, http_fetcher=http_fetcher,
+                        http_cache=http_cache, snapshot_store=snapshot_store,
+                        detail_crawler=detail_crawler, rate_limiter=rate_limiter,
+                        parse_cache=parse_cache, merchant_index=merchant_index,
+                        run_id=RUN_ID, writer=writer
+                    )
+                    await scraper.run_async()
+                except Exception as e:
+                    logger.error(f"Fatal error running {bank_slug}: {e}")
+                    return _failed_summary(bank_slug, e)
+            # Outside the semaphore: the next bank starts while these rows are written
+            return await scraper.finish_writes()
+
+        results = await asyncio.gather(*(
+            run_one(bank_slug, ScraperClass)
+            for bank_slug, ScraperClass in scrapers_to_run.items()
+        ))
+
+    logger.info(f"HTTP cache: {http_cache.stats()}")
+    logger.info(f"Rate limits: {rate_limiter.stats()}")
+    logger.info(f"Detail pages: {detail_crawler.fetched} parsed, {detail_crawler.failed} failed")
+    logger.info(f"Parse cache: {parse_cache.stats()}")
+    logger.info(f"Merchant index: {merchant_index.stats()}")
+    logger.info(f"Writer: {writer.stats()}")
+    http_cache.close()
+    parse_cache.close()
+    snapshot_store.save()
+    return results
 
 
-def run_all(bank_filter=None):
+async def _replay_scrapers(scrapers_to_run, run_id: str, manifest: dict):
+    """Re-run extraction + normalization for each bank against stored snapshots."""
+    store = SnapshotStore(run_id)
+    results, normalized = [], []
+    for bank_slug, ScraperClass in scrapers_to_run.items():
+        try:
+            scraper = ScraperClass(replay=ReplaySource(store, manifest, bank_slug))
+            results.append(await scraper.run_async())
+            normalized.extend(scraper.normalized)
+        except Exception as e:
+            logger.error(f"Fatal error replaying {bank_slug}: {e}")
+            results.append(_failed_summary(bank_slug, e))
+    return results, normalized
+
+
+def replay_run(run_id: str, bank_filter=None, output_path=None):
+    """
+    Replay a stored run offline: no browser, no network, no DB writes.
+    Optionally writes the normalized campaigns to `output_path` as JSONL.
+    """
+    try:
+        manifest = SnapshotStore.load_manifest(run_id)
+    except FileNotFoundError:
+        logger.error(f"No snapshot manifest for run {run_id}. "
+                     f"Available: {SnapshotStore.list_runs()[-10:]}")
+        return 1
+
+    scrapers_to_run = {k: v for k, v in SCRAPERS.items() if k in manifest["banks"]}
+    if bank_filter:
+        scrapers_to_run = {k: v for k, v in scrapers_to_run.items() if k in bank_filter}
+
+    logger.info(f"Replaying run {run_id} for {len(scrapers_to_run)} banks: {list(scrapers_to_run.keys())}")
+    logger.info("=" * 80)
+
+    results, normalized = asyncio.run(_replay_scrapers(scrapers_to_run, run_id, manifest))
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            for campaign in normalized:
+                f.write(json.dumps(campaign, ensure_ascii=False) + "\n")
+        logger.info(f"Wrote {len(normalized)} normalized campaigns to {output_path}")
+
+    return print_summary(results)
+
+
+def run_all(bank_filter=None, concurrency: int = 1):
     """Run all scrapers (or a subset) and collect results."""
-    results = []
     scrapers_to_run = SCRAPERS
 
     if bank_filter:
         scrapers_to_run = {k: v for k, v in SCRAPERS.items() if k in bank_filter}
 
     logger.info(f"Starting scrape run for {len(scrapers_to_run)} banks: {list(scrapers_to_run.keys())}")
+    if concurrency > 1:
+        logger.info(f"Running up to {concurrency} banks concurrently")
     logger.info("=" * 80)
 
-    for bank_slug, ScraperClass in scrapers_to_run.items():
-        logger.info(f"\n{'='*80}")
-        logger.info(f"Running {bank_slug.upper()} scraper...")
-        logger.info(f"{'='*80}")
-        try:
-            scraper = ScraperClass()
-            summary = scraper.run()
-            results.append(summary)
-        except Exception as e:
-            logger.error(f"Fatal error running {bank_slug}: {e}")
-            results.append({
-                "bank": bank_slug,
-                "scraped": 0,
-                "saved": 0,
-                "errors": 1,
-                "error_details": [str(e)],
-                "elapsed_seconds": 0,
-            })
-
-    # Print summary
+    results = asyncio.run(_run_scrapers(scrapers_to_run, concurrency))
+    return print_summary(results)
+
+
+def print_summary(results) -> int:
+    """Log the per-bank summary table; returns the process exit code."""
     logger.info("\n" + "=" * 80)
     logger.info("SCRAPE RUN SUMMARY")
     logger.info("=" * 80)
@@ -76,6 +193,8 @@ def run_all(bank_filter=None):
     total_errors = 0
     for r in results:
         status = "✓ OK" if r["errors"] == 0 else f"✗ {r['errors']} ERRORS"
+        if r.get("unchanged") and r["errors"] == 0:
+            status = "✓ UNCHANGED"
         logger.info(
             f"  {r['bank']:20s} | scraped: {r['scraped']:3d} | "
             f"saved: {r['saved']:3d} | {r['elapsed_seconds']:5.1f}s | {status}"
@@ -114,10 +233,37 @@ if __name__ == "__main__":
         help='Only scrape specific banks (default: all)',
         metavar='BANK'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of banks to scrape in parallel (default: 1)',
+        metavar='N'
+    )
+    parser.add_argument(
+        '--replay',
+        help='Re-run extraction and normalization offline against a stored run',
+        metavar='RUN_ID'
+    )
+    parser.add_argument(
+        '--replay-out',
+        help='With --replay: write normalized campaigns to this JSONL file',
+        metavar='PATH'
+    )
+    parser.add_argument(
+        '--refresh-cards',
+        action='store_true',
+        help='Reload card maps from the database instead of the cache'
+    )
     args = parser.parse_args()
 
     try:
-        exit_code = run_all(bank_filter=args.banks)
+        if args.refresh_cards:
+            get_card_map_cache().invalidate()
+        if args.replay:
+            exit_code = replay_run(args.replay, bank_filter=args.banks, output_path=args.replay_out)
+        else:
+            exit_code = run_all(bank_filter=args.banks, concurrency=args.concurrency)
         sys.exit(exit_code)
     except KeyboardInterrupt:
         logger.warning("\n⚠️  Scraper interrupted by user")
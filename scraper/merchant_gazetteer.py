@@ -0,0 +1,95 @@
+"""
+Merchant gazetteer: canonical merchants and their aliases (merchants.json).
+
+Every alias, and every canonical name, is folded and loaded into one
+Aho-Corasick automaton (keyword_automaton.py), so finding the merchant a
+title mentions is one pass over the title. An occurrence only counts as a
+whole word: it must start a word and be followed by a non-letter (space,
+apostrophe, ".com", end of text) or by a Turkish suffix written without an
+apostrophe ("Trendyolda", "Migrosta"). When several merchants match, the
+earliest one wins, then the longest alias ("trendyol go yemek" over
+"trendyol").
+
+Each entry has a "key": the canonical merchant_pattern stored with its
+campaigns, so every spelling of a merchant ends up under one exact key.
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Any, List, Optional
+from keyword_automaton import KeywordAutomaton, fold
+from config import MERCHANT_GAZETTEER_PATH
+
+logger = logging.getLogger("scraper.merchant_gazetteer")
+
+# Case suffixes accepted right after an alias (folded like the text)
+TURKISH_SUFFIXES = {fold(suffix) for suffix in (
+    "da", "de", "ta", "te", "nda", "nde",
+    "dan", "den", "tan", "ten", "ndan", "nden",
+    "a", "e", "ya", "ye", "na", "ne",
+    "ın", "in", "un", "ün", "nın", "nin", "nun", "nün",
+)}
+
+
+def _word_end(folded: str, end: int) -> int:
+    while end < len(folded) and folded[end].isalnum():
+        end += 1
+    return end
+
+
+class MerchantGazetteer:
+    """Canonical merchants, matched in text with one automaton."""
+
+    def __init__(self, path: str = MERCHANT_GAZETTEER_PATH):
+        with open(path, encoding="utf-8") as f:
+            entries: List[Dict[str, Any]] = json.load(f)
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        aliases: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            self.entries[entry["key"]] = entry
+            for alias in [entry["name"], entry["key"], *entry.get("aliases", [])]:
+                alias = fold(alias).strip()
+                other = aliases.setdefault(alias, entry)
+                if other is not entry:
+                    logger.warning(f"Alias '{alias}' of {entry['key']} already belongs to {other['key']}")
+        self.aliases = aliases
+        self._automaton = KeywordAutomaton(aliases)
+        # Part of the memo namespaces: editing merchants.json invalidates cached results
+        self.digest = hashlib.sha1(
+            json.dumps(entries, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:12]
+        logger.debug(f"Loaded {len(self.entries)} merchants, {len(aliases)} aliases from {path}")
+
+    def find(self, text: str) -> Optional[Dict[str, Any]]:
+        """The gazetteer entry text mentions, or None."""
+        if not text:
+            return None
+        folded = fold(text)
+        best = None
+        for start, alias, entry in self._automaton.iter(folded):
+            if start > 0 and folded[start - 1].isalnum():
+                continue
+            end = start + len(alias)
+            if end < len(folded) and folded[end].isalnum():
+                if folded[end:_word_end(folded, end)] not in TURKISH_SUFFIXES:
+                    continue
+            if best is None or (start, -len(alias)) < (best[0], -best[1]):
+                best = (start, len(alias), entry)
+        return best[2] if best else None
+
+    def key_for(self, merchant_name: str) -> Optional[str]:
+        """Canonical key for a merchant name, or None if it is not in the gazetteer."""
+        entry = self.aliases.get(fold(merchant_name).strip()) or self.find(merchant_name)
+        return entry["key"] if entry else None
+
+
+_gazetteer: Optional[MerchantGazetteer] = None
+
+
+def get_gazetteer() -> MerchantGazetteer:
+    """The shared gazetteer over merchants.json, loaded on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = MerchantGazetteer()
+    return _gazetteer
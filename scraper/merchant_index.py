@@ -0,0 +1,120 @@
+"""
+Trigram index over merchant_pattern values.
+
+The index holds the canonical merchant patterns: the gazetteer keys
+(merchant_gazetteer.py) first, then the active patterns already in the
+database. Every pattern is compacted (folded, letters and digits only, so
+"media markt" and "mediamarkt" are the same) and posted under its
+trigrams. A lookup only counts the trigrams it shares with the patterns in
+its own posting lists and scores them by Dice coefficient; no other
+patterns are compared.
+
+canonical() runs at write time and never guesses. It maps a new pattern
+onto an existing one only when they are the same compacted string, or
+onto a gazetteer key when the pattern is one of that merchant's aliases.
+Otherwise the new pattern becomes canonical itself. Similar-looking names
+are often different merchants ("kotonn" / "koton"), so trigram scores are
+only used by resolve(), which is read-only.
+"""
+import logging
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from keyword_automaton import fold
+from merchant_gazetteer import get_gazetteer
+from config import MERCHANT_RESOLVE_MIN_SCORE
+
+logger = logging.getLogger("scraper.merchant_index")
+
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+
+def _compact(pattern: str) -> str:
+    return _NON_ALNUM.sub("", fold(pattern))
+
+
+def _trigrams(compact: str) -> Set[str]:
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MerchantIndex:
+    """Canonical merchant patterns with trigram posting lists."""
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None):
+        gazetteer = get_gazetteer()
+        # Compacted gazetteer alias -> its merchant's key
+        self._aliases: Dict[str, str] = {
+            _compact(alias): entry["key"] for alias, entry in gazetteer.aliases.items()
+        }
+        self.patterns: List[str] = []
+        self._sizes: List[int] = []
+        self._by_compact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self.merged = 0
+        # Set once the database's active patterns are in (BaseScraper loads them)
+        self.loaded = False
+        self.extend(gazetteer.entries if patterns is None else patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def extend(self, patterns: Iterable[str]):
+        """Add patterns as they are, without merging (already canonical)."""
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+
+    def _add(self, pattern: str) -> str:
+        compact = _compact(pattern)
+        existing = self._by_compact.get(compact)
+        if existing is not None:
+            return self.patterns[existing]
+        pattern_id = len(self.patterns)
+        grams = _trigrams(compact)
+        self.patterns.append(pattern)
+        self._sizes.append(len(grams))
+        self._by_compact[compact] = pattern_id
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(pattern_id)
+        return pattern
+
+    def resolve(self, query: str, limit: int = 5,
+                min_score: float = MERCHANT_RESOLVE_MIN_SCORE) -> List[Tuple[str, float]]:
+        """Best matching patterns for query: [(pattern, score)], best first, score in 0..1."""
+        compact = _compact(query or "")
+        if not compact:
+            return []
+        exact = self._by_compact.get(compact)
+        grams = _trigrams(compact)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for pattern_id, count in shared.items():
+            score = 1.0 if pattern_id == exact else 2 * count / (len(grams) + self._sizes[pattern_id])
+            if score >= min_score:
+                scored.append((score, pattern_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.patterns[pattern_id], round(score, 3)) for score, pattern_id in scored[:limit]]
+
+    def canonical(self, pattern: str) -> str:
+        """The canonical pattern for a newly written one (see module docstring)."""
+        compact = _compact(pattern or "")
+        if not compact:
+            return pattern
+        exact = self._by_compact.get(compact)
+        if exact is not None:
+            if self.patterns[exact] != pattern:
+                self.merged += 1
+            return self.patterns[exact]
+        key = self._aliases.get(compact)
+        if key is not None:
+            self.merged += 1
+            logger.debug(f"Merged merchant pattern '{pattern}' into gazetteer key '{key}'")
+            return self._add(key)
+        return self._add(pattern)
+
+    def stats(self) -> Dict[str, int]:
+        return {"patterns": len(self.patterns), "trigrams": len(self._postings), "merged": self.merged}
@@ -0,0 +1,154 @@
+"""
+Network capture extraction mode.
+
+Some bank sites render their campaign grid client-side from a JSON feed
+(worldcard.com.tr and qnbcard.com.tr use Underscore templates). Instead of
+waiting for that JSON to become HTML and parsing it back, we record the
+matching XHR/fetch responses and read the items straight out of them.
+
+A bank enables this with a "network_capture" entry in BANK_CONFIG:
+
+    "network_capture": {
+        "url_pattern": r"kampanya",         # regex on the response URL
+        "items_path": "Data.Items",          # dotted path to the list (recommended)
+        "fields": {"title": ["PageTitle"]},  # optional, overrides CAPTURE_FIELD_KEYS
+    }
+
+Without items_path the largest list whose objects look like campaigns (a
+title plus a link or a date) is used, so menus and filter lists do not
+qualify. When the captured items still do not look like campaigns the
+scraper reads the DOM instead (BaseScraper.captured_campaigns).
+"""
+import asyncio
+import logging
+import re
+from typing import Dict, Any, List, Tuple
+from playwright.async_api import Page, Response
+
+logger = logging.getLogger("scraper.network_capture")
+
+# Candidate JSON keys per raw campaign field, tried in order
+CAPTURE_FIELD_KEYS = {
+    "title": ["PageTitle", "Title", "title", "Name", "name", "Header", "header"],
+    "description": ["ShortDescription", "Description", "description", "Summary", "summary", "Spot", "spot"],
+    "source_url": ["Url", "url", "PageUrl", "DetailUrl", "detailUrl", "Link", "link", "Href", "href"],
+    "start_date": ["StartDate", "startDate", "BeginDate", "beginDate"],
+    "end_date": ["EndDate", "endDate", "FinishDate", "finishDate", "LastDay", "lastDay", "ExpireDate"],
+}
+
+_ISO_DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+
+# Share of captured objects that must look like campaigns to be used
+CAMPAIGN_LIKE_SHARE = 0.8
+
+
+class NetworkCapture:
+    """Records JSON responses from XHR/fetch requests that match a URL pattern."""
+
+    RESOURCE_TYPES = {"xhr", "fetch"}
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.url_pattern = re.compile(spec["url_pattern"], re.IGNORECASE)
+        self.items_path = spec.get("items_path")
+        self.field_keys = {**CAPTURE_FIELD_KEYS, **spec.get("fields", {})}
+        self.payloads: List[Tuple[str, Any]] = []
+        self._pending: List[asyncio.Task] = []
+
+    def attach(self, page: Page):
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response):
+        if response.request.resource_type not in self.RESOURCE_TYPES:
+            return
+        if not self.url_pattern.search(response.url):
+            return
+        self._pending.append(asyncio.ensure_future(self._read(response)))
+
+    async def _read(self, response: Response):
+        try:
+            self.payloads.append((response.url, await response.json()))
+        except Exception as e:
+            # Not JSON (or body already gone) - ignore it
+            logger.debug(f"Skipping captured response {response.url}: {e}")
+
+    async def drain(self):
+        """Wait for bodies of responses seen so far to be read."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+            self._pending.clear()
+
+    def reset(self):
+        """Forget captured responses, before loading the next listing."""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+        self.payloads = []
+
+    def items(self) -> List[Dict[str, Any]]:
+        """All item objects found in the captured payloads."""
+        items = []
+        for url, payload in self.payloads:
+            found = self._locate_items(payload)
+            logger.debug(f"{len(found)} items in captured response {url}")
+            items.extend(found)
+        return items
+
+    def _locate_items(self, payload: Any) -> List[Dict[str, Any]]:
+        if self.items_path:
+            node = payload
+            for key in self.items_path.split('.'):
+                if not isinstance(node, dict):
+                    return []
+                node = node.get(key)
+            return [i for i in node if isinstance(i, dict)] if isinstance(node, list) else []
+
+        best: List[Dict[str, Any]] = []
+        stack = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                dicts = [i for i in node if isinstance(i, dict)]
+                if len(dicts) > len(best) and self.campaign_like_share(dicts) >= CAMPAIGN_LIKE_SHARE:
+                    best = dicts
+                stack.extend(node)
+        return best
+
+    def looks_like_campaign(self, item: Dict[str, Any]) -> bool:
+        """A title plus a link or a date, which menu and filter entries lack."""
+        if not self.field(item, "title"):
+            return False
+        return any(self.field(item, name) for name in ("source_url", "start_date", "end_date"))
+
+    def campaign_like_share(self, items: List[Dict[str, Any]]) -> float:
+        if not items:
+            return 0.0
+        return sum(1 for item in items if self.looks_like_campaign(item)) / len(items)
+
+    def field(self, item: Dict[str, Any], name: str) -> str:
+        """First non-empty value among the candidate keys for a field."""
+        for key in self.field_keys.get(name, []):
+            value = item.get(key)
+            if value not in (None, ""):
+                return str(value).strip()
+        return ""
+
+    def date_text(self, item: Dict[str, Any]) -> str:
+        """
+        Build a date_text the normalizer understands ("DD.MM.YYYY - DD.MM.YYYY").
+        A lone start date is dropped, since one date is read as the end date.
+        """
+        start = self._format_date(self.field(item, "start_date"))
+        end = self._format_date(self.field(item, "end_date"))
+        if start and end:
+            return f"{start} - {end}"
+        return end
+
+    @staticmethod
+    def _format_date(value: str) -> str:
+        match = _ISO_DATE.match(value)
+        if match:
+            year, month, day = match.groups()
+            return f"{day}.{month}.{year}"
+        return value
@@ -0,0 +1,160 @@
+"""
+Memoization for the pure text parsers.
+
+The same discount, date and merchant strings repeat across cards, banks and
+runs, so CampaignNormalizer (parse_discount, parse_dates,
+generate_merchant_pattern) and BaseScraper._extract_merchant look their
+results up here before parsing:
+
+- a bounded in-memory LRU per process
+- optionally a persistent SQLite tier (data/parse_cache.db) shared by runs
+
+Every entry carries the parser version (NORMALIZER_VERSION in
+normalizer.py). Opening the disk tier drops rows written by any other
+version, so a parser change never serves results computed by the old code.
+Values are stored as JSON; tuples come back as tuples.
+
+Disk rows record when they were last written or read (last_used); close()
+trims the tier to its max_rows most recently used rows.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from config import PARSE_CACHE_SIZE, PARSE_CACHE_MAX_ROWS
+
+logger = logging.getLogger("scraper.parse_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    namespace TEXT NOT NULL,
+    text TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, text)
+);
+CREATE INDEX IF NOT EXISTS idx_parsed_last_used ON parsed(last_used);
+"""
+
+# Rows buffered before they are written to the disk tier
+_FLUSH_EVERY = 500
+
+_MISSING = object()
+
+
+class ParseCache:
+    """Bounded LRU of parse results, optionally backed by SQLite."""
+
+    def __init__(self, version: int, maxsize: int = PARSE_CACHE_SIZE, path: Optional[str] = None,
+                 max_rows: int = PARSE_CACHE_MAX_ROWS):
+        self.version = version
+        self.maxsize = maxsize
+        self.path = path
+        self.max_rows = max_rows
+        self._lru: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._touched = []
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            stale = self._conn.execute("DELETE FROM parsed WHERE version != ?", (version,)).rowcount
+            self._conn.commit()
+            if stale:
+                logger.info(f"Dropped {stale} parse cache entries from other parser versions")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def memo(self, namespace: str, text: str, compute: Callable[[str], Any]) -> Any:
+        """compute(text), remembered under (namespace, text)."""
+        key = (namespace, text)
+        with self._lock:
+            value = self._lru.get(key, _MISSING)
+            if value is not _MISSING:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._load(namespace, text)
+        if value is not _MISSING:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            value = compute(text)
+            self._store(namespace, text, value)
+
+        with self._lock:
+            self._lru[key] = value
+            if len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+        return value
+
+    def _load(self, namespace: str, text: str) -> Any:
+        if self._conn is None:
+            return _MISSING
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM parsed WHERE namespace = ? AND text = ?", (namespace, text)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            self._touched.append((time.time(), namespace, text))
+            if len(self._pending) + len(self._touched) >= _FLUSH_EVERY:
+                self._flush()
+        value = json.loads(row[0])
+        return tuple(value) if isinstance(value, list) else value
+
+    def _store(self, namespace: str, text: str, value: Any):
+        if self._conn is None:
+            return
+        with self._lock:
+            self._pending.append(
+                (namespace, text, self.version, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            if len(self._pending) + len(self._touched) >= _FLUSH_EVERY:
+                self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parsed (namespace, text, version, value, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._pending
+            )
+            self._pending = []
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE parsed SET last_used = ? WHERE namespace = ? AND text = ?", self._touched
+            )
+            self._touched = []
+        self._conn.commit()
+
+    def close(self):
+        """Write buffered entries and trim the disk tier to its max_rows most recently used."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._flush()
+            excess = self._conn.execute("SELECT COUNT(*) FROM parsed").fetchone()[0] - self.max_rows
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM parsed WHERE rowid IN "
+                    "(SELECT rowid FROM parsed ORDER BY last_used ASC LIMIT ?)",
+                    (excess,)
+                )
+                self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        """hits = memory hits, disk_hits = loaded from SQLite, misses = parsed."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
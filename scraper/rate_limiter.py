@@ -0,0 +1,235 @@
+"""
+Per-host rate limiting shared by every fetch path.
+
+Each bank host gets a token bucket (requests/second + burst) and a cap on
+requests in flight, configured with a "rate_limit" entry in BANK_CONFIG:
+
+    "rate_limit": {"rate": 2.0, "burst": 4, "concurrency": 2}
+
+Hosts without an entry use RATE_LIMIT_DEFAULTS. The rate adapts AIMD-style:
+a 429/503 or a response slower than slow_ms halves it (down to min_rate,
+honouring Retry-After), and every good response adds `increase` back, up
+to the configured rate.
+
+A limiter is thread-safe and can be used from plain code, worker threads
+and asyncio alike:
+
+    with limiter.limit(url): ...            # sync / threads
+    async with limiter.alimit(url): ...     # asyncio
+    limiter.record(url, status, elapsed_s)  # feedback for AIMD
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+from config import BANK_CONFIG, RATE_LIMIT_DEFAULTS
+
+logger = logging.getLogger("scraper.rate_limit")
+
+THROTTLE_STATUSES = {429, 503}
+# Don't halve again for responses to requests that were already in flight
+DECREASE_COOLDOWN = 2.0  # seconds
+
+
+class HostLimiter:
+    """Token bucket + concurrency cap + AIMD for one host."""
+
+    def __init__(self, host: str, rate: float, burst: int, concurrency: int,
+                 min_rate: float, increase: float, slow_ms: int):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.min_rate = min_rate
+        self.increase = increase
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._slot_free = threading.Condition(self._lock)
+        self._async_waiters: deque = deque()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    # -- concurrency slots -------------------------------------------------
+
+    def _take_slot(self) -> bool:
+        if self._in_flight < self.concurrency:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._slot_free.notify()
+            self._wake_async_waiter()
+
+    def _wake_async_waiter(self):
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            if not future.done():
+                loop.call_soon_threadsafe(_wake, future)
+                break
+
+    # -- token bucket ------------------------------------------------------
+
+    def _reserve(self) -> float:
+        """Take a token (possibly on credit); returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.requests += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+            return wait
+
+    def acquire(self):
+        """Blocking acquire for sync and threaded callers."""
+        with self._slot_free:
+            while not self._take_slot():
+                self._slot_free.wait()
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._take_slot():
+                    break
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, future) in self._async_waiters:
+                        self._async_waiters.remove((loop, future))
+                    else:
+                        # Already woken: pass the free slot on
+                        self._wake_async_waiter()
+                raise
+        try:
+            wait = self._reserve()
+            if wait:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._release()
+            raise
+
+    # -- feedback ----------------------------------------------------------
+
+    def record(self, status: Optional[int], elapsed: float,
+               retry_after: Optional[float] = None):
+        """Adapt the rate to a response (status None = request failed)."""
+        with self._lock:
+            now = time.monotonic()
+            slow = elapsed * 1000 > self.slow_ms
+            if status in THROTTLE_STATUSES or slow:
+                self.throttled += 1
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    old = self.rate
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    reason = f"HTTP {status}" if not slow else f"{elapsed:.1f}s response"
+                    logger.info(f"{self.host}: {reason}, rate {old:.2f} -> {self.rate:.2f} req/s")
+                if retry_after:
+                    # Drain the bucket so the next request waits out Retry-After
+                    self._tokens = min(self._tokens, 1 - retry_after * self.rate)
+                    self._updated = now
+            elif status is not None and status < 500:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "rate": round(self.rate, 2),
+            "waited_s": round(self.waited, 1),
+        }
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimiter:
+    """Registry of per-host limiters, built from BANK_CONFIG."""
+
+    def __init__(self, bank_config: Dict[str, Any] = BANK_CONFIG,
+                 defaults: Dict[str, Any] = RATE_LIMIT_DEFAULTS):
+        self.defaults = defaults
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        for config in bank_config.values():
+            spec = config.get("rate_limit")
+            if not spec:
+                continue
+            urls = [config.get("base_url", ""), *config.get("urls", {}).values()]
+            for url in urls:
+                host = _host(url)
+                if host:
+                    self._specs[host] = spec
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> HostLimiter:
+        host = _host(url)
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                spec = {**self.defaults, **self._specs.get(host, {})}
+                limiter = HostLimiter(host, **spec)
+                self._hosts[host] = limiter
+            return limiter
+
+    @contextmanager
+    def limit(self, url: str):
+        limiter = self.for_url(url)
+        limiter.acquire()
+        try:
+            yield limiter
+        finally:
+            limiter._release()
+
+    @asynccontextmanager
+    async def alimit(self, url: str):
+        limiter = self.for_url(url)
+        await limiter.acquire_async()
+        try:
+            yield limiter
+        finally:
+            limiter._release()
+
+    def record(self, url: str, status: Optional[int], elapsed: float,
+               retry_after: Optional[str] = None):
+        self.for_url(url).record(status, elapsed, _retry_after_seconds(retry_after))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {host: limiter.stats() for host, limiter in self._hosts.items()}
+
+
+def _host(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After in seconds (HTTP-date values are ignored)."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
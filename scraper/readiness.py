@@ -0,0 +1,196 @@
+"""
+Event-driven page readiness.
+
+Waits on real signals instead of fixed sleeps:
+- network idle: no requests in flight for a quiet window
+- DOM stability: a selector's match count that stops changing, watched
+  inside the page with a MutationObserver
+- response events: a response whose URL matches a pattern
+
+Every wait takes a ceiling (ms); the ceiling is only a fallback and most
+waits return as soon as the page is actually ready.
+"""
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, Optional
+from playwright.async_api import Page, Request, Response
+from config import NETWORK_IDLE_MS, DOM_QUIET_MS, LONG_POLL_MS
+
+logger = logging.getLogger("scraper.readiness")
+
+# Resolves once document.querySelectorAll(selector).length >= minCount and has
+# not changed for quietMs, or when timeoutMs runs out (settled = false).
+_STABLE_COUNT_JS = """
+([selector, quietMs, timeoutMs, minCount]) => new Promise(resolve => {
+    const count = () => document.querySelectorAll(selector).length;
+    let last = count();
+    let quietTimer = null;
+    let observer = null;
+    let ceiling = null;
+    const finish = (settled) => {
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(ceiling);
+        resolve({count: count(), settled});
+    };
+    const arm = () => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => { if (last >= minCount) finish(true); }, quietMs);
+    };
+    observer = new MutationObserver(() => {
+        const c = count();
+        if (c !== last) { last = c; arm(); }
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    ceiling = setTimeout(() => finish(false), timeoutMs);
+    arm();
+})
+"""
+
+
+class PageReadiness:
+    """Tracks network activity on a page and waits for it to become ready."""
+
+    # Long-lived connections never "finish" and must not hold up idle detection
+    IGNORED_RESOURCE_TYPES = {"websocket", "eventsource"}
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._in_flight: Dict[Request, float] = {}
+        self._last_activity = time.monotonic()
+        self._activity = asyncio.Event()
+        page.on("request", self._on_request_start)
+        page.on("requestfinished", self._on_request_end)
+        page.on("requestfailed", self._on_request_end)
+
+    def _on_request_start(self, request: Request):
+        if request.resource_type in self.IGNORED_RESOURCE_TYPES:
+            return
+        self._in_flight[request] = time.monotonic()
+        self._mark_activity()
+
+    def _on_request_end(self, request: Request):
+        if self._in_flight.pop(request, None) is not None:
+            self._mark_activity()
+
+    def _mark_activity(self):
+        self._last_activity = time.monotonic()
+        self._activity.set()
+
+    def in_flight(self) -> int:
+        """Requests currently in flight, ignoring ones open longer than LONG_POLL_MS."""
+        cutoff = time.monotonic() - LONG_POLL_MS / 1000
+        return sum(1 for started in self._in_flight.values() if started >= cutoff)
+
+    async def wait_for_network_idle(self, idle_ms: int = NETWORK_IDLE_MS,
+                                    timeout_ms: int = 10000) -> bool:
+        """Wait until no requests have been in flight for `idle_ms`. False on timeout."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        idle = idle_ms / 1000
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            if self.in_flight() == 0:
+                quiet_for = now - self._last_activity
+                if quiet_for >= idle:
+                    return True
+                wait = idle - quiet_for
+            else:
+                # Re-check periodically so long-polls age out of in_flight()
+                wait = min(LONG_POLL_MS / 1000, 0.5)
+            self._activity.clear()
+            try:
+                await asyncio.wait_for(self._activity.wait(), min(wait, deadline - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def wait_for_stable_count(self, selector: str, min_count: int = 1,
+                                    quiet_ms: int = DOM_QUIET_MS,
+                                    timeout_ms: int = 10000) -> Dict[str, Any]:
+        """
+        Wait until `selector` matches at least `min_count` nodes and the count
+        has stopped changing for `quiet_ms`.
+
+        Returns {"count": int, "settled": bool}; settled is False when the
+        ceiling was hit first.
+        """
+        try:
+            return await self.page.evaluate(
+                _STABLE_COUNT_JS, [selector, quiet_ms, timeout_ms, min_count]
+            )
+        except Exception as e:
+            # Navigation during the wait destroys the execution context
+            logger.debug(f"Stable-count wait aborted for {selector}: {e}")
+            return {"count": await self.count(selector), "settled": False}
+
+    async def wait_for_response(self, url_pattern: str,
+                                timeout_ms: int = 10000) -> Optional[Response]:
+        """Wait for the next response whose URL matches `url_pattern`. None on timeout."""
+        pattern = re.compile(url_pattern)
+        try:
+            return await self.page.wait_for_event(
+                "response",
+                predicate=lambda response: bool(pattern.search(response.url)),
+                timeout=timeout_ms,
+            )
+        except Exception:
+            return None
+
+    async def wait_for_more(self, selector: str, before: int,
+                            timeout_ms: int = 3000) -> Dict[str, Any]:
+        """
+        After a scroll/click: wait until `selector` matches more than `before`
+        nodes and settles, or until the network goes quiet with no growth.
+
+        The quiet window restarts now, so a lazy loader that fires its
+        request a moment after the scroll is still waited for. Returns
+        {"count": int, "grew": bool}.
+        """
+        self._mark_activity()
+        growth = asyncio.ensure_future(self.wait_for_stable_count(
+            selector, min_count=before + 1, timeout_ms=timeout_ms
+        ))
+        idle = asyncio.ensure_future(self.wait_for_network_idle(timeout_ms=timeout_ms))
+        await asyncio.wait({growth, idle}, return_when=asyncio.FIRST_COMPLETED)
+
+        if not growth.done():
+            # Network went quiet first: only keep waiting if items did appear
+            if await self.count(selector) <= before:
+                growth.cancel()
+                return {"count": before, "grew": False}
+            await growth
+        idle.cancel()
+        count = growth.result()["count"]
+        return {"count": count, "grew": count > before}
+
+    async def count(self, selector: str) -> int:
+        try:
+            return await self.page.evaluate(
+                "(selector) => document.querySelectorAll(selector).length", selector
+            )
+        except Exception:
+            return 0
+
+    async def wait_ready(self, selector: Optional[str] = None,
+                         ceiling_ms: int = 20000) -> Dict[str, Any]:
+        """
+        Wait for the page to be ready: the selector (if any) has a stable
+        non-zero count and the network has gone idle, all within `ceiling_ms`.
+        """
+        start = time.monotonic()
+        waits = [self.wait_for_network_idle(timeout_ms=ceiling_ms)]
+        if selector:
+            waits.append(self.wait_for_stable_count(selector, timeout_ms=ceiling_ms))
+        results = await asyncio.gather(*waits)
+
+        ready = {
+            "network_idle": results[0],
+            "count": results[1]["count"] if selector else None,
+            "settled": results[1]["settled"] if selector else True,
+            "elapsed_ms": int((time.monotonic() - start) * 1000),
+        }
+        logger.debug(f"Page ready: {ready}")
+        return ready
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Re-normalize stored raw campaigns, e.g. after a normalizer fix.
+
+Reads raw campaign dicts from JSONL dumps or from the raw campaigns a
+scrape run recorded in its snapshots, and normalizes them with
+CampaignNormalizer.normalize_batch() on every core. Nothing is written to
+the database; --out writes the normalized campaigns as JSONL.
+
+Usage:
+    python renormalize.py                              # latest recorded run
+    python renormalize.py --run 20260213_153001 --banks akbank --out akbank.jsonl
+    python renormalize.py --jsonl raw_2025.jsonl raw_2026.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from normalizer import CampaignNormalizer
+from snapshot_store import SnapshotStore, ReplaySource
+
+
+def read_jsonl(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def read_run(run_id: Optional[str], banks: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+    runs = SnapshotStore.list_runs()
+    if not runs:
+        return
+    run_id = run_id or runs[-1]
+    store = SnapshotStore(run_id)
+    manifest = SnapshotStore.load_manifest(run_id)
+    for bank_slug in manifest["banks"]:
+        if banks and bank_slug not in banks:
+            continue
+        campaigns = ReplaySource(store, manifest, bank_slug).raw_campaigns()
+        print(f"Run {run_id} {bank_slug}: {len(campaigns)} raw campaigns")
+        yield from campaigns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-normalize stored raw campaigns")
+    parser.add_argument('--jsonl', nargs='+', help='Raw campaign dumps (one JSON object per line)', metavar='FILE')
+    parser.add_argument('--run', help='Snapshot run id (default: latest)', metavar='RUN_ID')
+    parser.add_argument('--banks', nargs='+', help='With a run: only these banks', metavar='BANK')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: all cores)', metavar='N')
+    parser.add_argument('--out', help='Write normalized campaigns to this JSONL file', metavar='PATH')
+    args = parser.parse_args()
+
+    campaigns = read_jsonl(args.jsonl) if args.jsonl else read_run(args.run, args.banks)
+
+    start = time.perf_counter()
+    normalized, errors = CampaignNormalizer().normalize_batch(campaigns, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    total = len(normalized) + len(errors)
+    if not total:
+        print("No raw campaigns found: pass --jsonl or record a run first")
+        return 1
+    print(f"Normalized {len(normalized)}/{total} campaigns in {elapsed:.2f}s "
+          f"({total / elapsed:,.0f}/s, {args.workers} workers)")
+    for error in errors[:10]:
+        print(f"  ✗ #{error['index']} {error['title']}: {error['error']}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for campaign in normalized:
+                f.write(json.dumps(campaign, ensure_ascii=False) + "\n")
+        print(f"Wrote {len(normalized)} normalized campaigns to {args.out}")
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
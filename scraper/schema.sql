@@ -41,6 +41,9 @@ CREATE TABLE IF NOT EXISTS campaigns (
     source_url TEXT,
     scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     is_active BOOLEAN DEFAULT 1,
+    content_hash TEXT,
+    last_seen_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    last_run_id TEXT,
     FOREIGN KEY (card_id) REFERENCES cards(id) ON DELETE CASCADE
 );
 
@@ -48,4 +51,5 @@ CREATE TABLE IF NOT EXISTS campaigns (
 CREATE INDEX IF NOT EXISTS idx_cards_bank_id ON cards(bank_id);
 CREATE INDEX IF NOT EXISTS idx_campaigns_card_id ON campaigns(card_id);
 CREATE INDEX IF NOT EXISTS idx_campaigns_active ON campaigns(is_active);
+CREATE INDEX IF NOT EXISTS idx_campaigns_card_active ON campaigns(card_id, is_active);
 CREATE INDEX IF NOT EXISTS idx_campaigns_merchant ON campaigns(merchant_pattern);
@@ -12,7 +12,7 @@ def seed_campaigns():
     db = SupabaseManager()
     normalizer = CampaignNormalizer()
 
-    # Get card IDs
+    # Get card IDs (one cached query for all banks)
     card_map_akbank = db.get_cards_for_bank('akbank')
     card_map_garanti = db.get_cards_for_bank('garanti')
     card_map_yapikredi = db.get_cards_for_bank('yapikredi')
@@ -147,24 +147,26 @@ def seed_campaigns():
 
     # Save to database
     print(f"\n💾 Saving {len(normalized)} normalized campaigns...")
-    saved_count = 0
-    for campaign in normalized:
-        try:
-            result = db.upsert_campaigns([campaign], "manual-seed")
-            saved_count += result
-        except Exception as e:
-            print(f"  ✗ Failed to save {campaign['title']}: {e}")
+    result = db.upsert_campaigns(normalized, "manual-seed")
+    saved_count = result["inserted"] + result["updated"] + result["unchanged"]
 
-    print(f"\n✅ Saved {saved_count}/{len(normalized)} campaigns to Supabase")
+    print(f"\n✅ Saved {saved_count}/{len(normalized)} campaigns to Supabase "
+          f"({result['inserted']} new, {result['updated']} updated, "
+          f"{result['unchanged']} unchanged, {result['failed']} failed)")
 
     # Verify
     print("\n🔍 Verifying database...")
     for bank_slug, card_map in [('akbank', card_map_akbank), ('garanti', card_map_garanti), ('yapikredi', card_map_yapikredi)]:
+        if not card_map:
+            continue
+        result = db.client.table('campaigns').select('card_id, title').in_(
+            'card_id', list(card_map.values())
+        ).eq('is_active', True).execute()
         for card_slug, card_id in card_map.items():
-            result = db.client.table('campaigns').select('id, title').eq('card_id', card_id).eq('is_active', True).execute()
-            print(f"  {card_slug}: {len(result.data)} active campaigns")
-            for c in result.data:
-                print(f"    - {c['title']}")
+            titles = [c['title'] for c in result.data if c['card_id'] == card_id]
+            print(f"  {card_slug}: {len(titles)} active campaigns")
+            for title in titles:
+                print(f"    - {title}")
 
 if __name__ == "__main__":
     seed_campaigns()
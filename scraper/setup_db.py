@@ -3,22 +3,17 @@
 Setup script to add UNIQUE constraint to Supabase.
 """
 import os
-from supabase import create_client
-from dotenv import load_dotenv
-
-load_dotenv()
+from supabase_client import get_client
 
 def setup_constraint():
     """Add UNIQUE constraint to campaigns table."""
     url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-    if not url or not key:
+    try:
+        supabase = get_client()
+    except ValueError:
         print("❌ Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in .env")
         return False
 
-    supabase = create_client(url, key)
-
     print("🔗 Connected to Supabase")
     print(f"   URL: {url}")
 
@@ -0,0 +1,256 @@
+"""
+Content-addressed snapshot store for fetched pages, with offline replay.
+
+Every listing/detail page, captured JSON feed and in-page extraction
+result (kind "items") a run reads, plus each bank's extracted raw campaigns
+(kind "raw", read back by renormalize.py), is stored
+compressed under data/snapshots/objects/<sha256[:2]>/<sha256>.zst, so
+identical pages across runs are stored once. Each run writes a manifest
+(data/snapshots/runs/<run-id>.json) listing, per bank, the card map and
+the URL -> snapshot digests in the order they were read.
+
+`python main.py --replay <run-id>` feeds those snapshots back to each
+bank's extract_campaigns() and the normalizer: no browser, no network,
+no database.
+
+save() keeps the newest SNAPSHOT_KEEP_RUNS manifests and deletes the
+objects no remaining manifest refers to. Objects written or reused since
+this run started are never deleted, so a run still in progress elsewhere
+keeps its snapshots.
+
+zstd needs the `zstandard` package; without it snapshots fall back to gzip.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from config import SNAPSHOT_DIR, SNAPSHOT_KEEP_RUNS
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip fallback
+    zstandard = None
+
+logger = logging.getLogger("scraper.snapshots")
+
+ZSTD_LEVEL = 10
+
+
+class SnapshotStore:
+    """Writes compressed, content-addressed page snapshots and run manifests."""
+
+    def __init__(self, run_id: str, root: str = SNAPSHOT_DIR, keep_runs: int = SNAPSHOT_KEEP_RUNS):
+        self.run_id = run_id
+        self.root = root
+        self.keep_runs = keep_runs
+        self._started = time.time()
+        self.objects_dir = os.path.join(root, "objects")
+        self.runs_dir = os.path.join(root, "runs")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.runs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.manifest: Dict[str, Any] = {
+            "run_id": run_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "banks": {},
+        }
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def _object_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}{ext}")
+
+    def put(self, data: bytes) -> str:
+        """Store bytes under their sha256 digest (no-op if already stored)."""
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._find(digest)
+        if existing:
+            # Touched so prune() in another process sees it as in use
+            try:
+                os.utime(existing)
+            except OSError:
+                pass
+            return digest
+
+        if zstandard is not None:
+            ext, compressed = ".zst", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            ext, compressed = ".gz", gzip.compress(data)
+        path = self._object_path(digest, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a crashed run never leaves a truncated object
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, path)
+
+        self.bytes_in += len(data)
+        self.bytes_stored += len(compressed)
+        return digest
+
+    def _find(self, digest: str) -> Optional[str]:
+        for ext in (".zst", ".gz"):
+            path = self._object_path(digest, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get(self, digest: str) -> bytes:
+        path = self._find(digest)
+        if path is None:
+            raise KeyError(f"Snapshot {digest} not found")
+        with open(path, "rb") as f:
+            data = f.read()
+        if path.endswith(".gz"):
+            return gzip.decompress(data)
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst snapshots")
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def _bank(self, bank_slug: str) -> Dict[str, Any]:
+        return self.manifest["banks"].setdefault(bank_slug, {"card_map": {}, "pages": []})
+
+    def set_card_map(self, bank_slug: str, card_map: Dict[str, int]):
+        with self._lock:
+            self._bank(bank_slug)["card_map"] = dict(card_map)
+
+    def record(self, bank_slug: str, url: str, content: str, kind: str = "html",
+               source: str = "browser"):
+        """
+        Snapshot one fetched document for a bank.
+
+        kind: "html", "json", "items" or "raw"; source: "http", "browser",
+        "capture", "evaluate" or "extract".
+        """
+        try:
+            digest = self.put(content.encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Failed to store snapshot for {url}: {e}")
+            return
+        with self._lock:
+            self._bank(bank_slug)["pages"].append({
+                "url": url, "kind": kind, "source": source, "digest": digest,
+            })
+
+    def save(self):
+        """Write this run's manifest."""
+        path = os.path.join(self.runs_dir, f"{self.run_id}.json")
+        with self._lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        pages = sum(len(b["pages"]) for b in self.manifest["banks"].values())
+        logger.info(
+            f"Saved snapshot manifest {path} ({pages} pages, "
+            f"{self.bytes_in // 1024} KB new -> {self.bytes_stored // 1024} KB on disk)"
+        )
+        self.prune()
+
+    def prune(self):
+        """Drop manifests beyond the newest keep_runs, then unreferenced objects."""
+        runs = self.list_runs(self.root)
+        old = [r for r in runs[:-self.keep_runs] if r != self.run_id] if self.keep_runs > 0 else []
+        if not old:
+            return
+        for run_id in old:
+            os.remove(os.path.join(self.runs_dir, f"{run_id}.json"))
+
+        referenced = set()
+        for run_id in self.list_runs(self.root):
+            try:
+                manifest = self.load_manifest(run_id, self.root)
+            except (OSError, ValueError) as e:
+                # Unreadable manifest: keep every object rather than guess
+                logger.warning(f"Not pruning snapshot objects, cannot read manifest {run_id}: {e}")
+                return
+            for bank in manifest["banks"].values():
+                referenced.update(page["digest"] for page in bank["pages"])
+
+        removed = freed = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                digest = name.split(".", 1)[0]
+                path = os.path.join(dirpath, name)
+                try:
+                    if digest in referenced or os.path.getmtime(path) >= self._started:
+                        continue
+                    size = os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    continue
+                removed += 1
+                freed += size
+        logger.info(f"Pruned {len(old)} old snapshot runs, {removed} objects ({freed // 1024} KB)")
+
+    @classmethod
+    def load_manifest(cls, run_id: str, root: str = SNAPSHOT_DIR) -> Dict[str, Any]:
+        path = os.path.join(root, "runs", f"{run_id}.json")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @classmethod
+    def list_runs(cls, root: str = SNAPSHOT_DIR) -> List[str]:
+        runs_dir = os.path.join(root, "runs")
+        if not os.path.isdir(runs_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(runs_dir) if name.endswith(".json"))
+
+
+class ReplaySource:
+    """Serves one bank's recorded pages back, in recorded order per URL."""
+
+    def __init__(self, store: SnapshotStore, manifest: Dict[str, Any], bank_slug: str):
+        bank = manifest["banks"].get(bank_slug, {"card_map": {}, "pages": []})
+        self.store = store
+        self.card_map: Dict[str, int] = bank["card_map"]
+        self._html: Dict[str, deque] = defaultdict(deque)
+        self._items: Dict[str, deque] = defaultdict(deque)
+        self.json_payloads: List[tuple] = []
+        self._raw: List[str] = []
+        for page in bank["pages"]:
+            if page["kind"] == "json":
+                self.json_payloads.append((page["url"], page["digest"]))
+            elif page["kind"] == "raw":
+                self._raw.append(page["digest"])
+            elif page["kind"] == "items":
+                self._items[page["url"]].append(page["digest"])
+            else:
+                self._html[page["url"]].append(page["digest"])
+
+    def _next(self, queues: Dict[str, deque], url: str) -> Optional[str]:
+        queue = queues.get(url)
+        if not queue:
+            return None
+        digest = queue.popleft() if len(queue) > 1 else queue[0]
+        return self.store.get(digest).decode("utf-8")
+
+    def html(self, url: str) -> Optional[str]:
+        """Next recorded HTML for url, or None if none is left."""
+        return self._next(self._html, url)
+
+    def has_items(self, url: str) -> bool:
+        return bool(self._items.get(url))
+
+    def items(self, url: str) -> Optional[List[Dict[str, str]]]:
+        """Next recorded in-page extraction result for url, or None."""
+        content = self._next(self._items, url)
+        return json.loads(content) if content is not None else None
+
+    def payloads(self) -> List[tuple]:
+        """Recorded JSON feeds as (url, parsed_json) pairs."""
+        return [
+            (url, json.loads(self.store.get(digest).decode("utf-8")))
+            for url, digest in self.json_payloads
+        ]
+
+    def raw_campaigns(self) -> List[Dict[str, Any]]:
+        """The raw campaigns the bank extracted in this run, or [] if not recorded."""
+        if not self._raw:
+            return []
+        return json.loads(self.store.get(self._raw[-1]).decode("utf-8"))
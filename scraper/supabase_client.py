@@ -1,33 +1,102 @@
 """
 Supabase client for database operations.
+
+One Supabase client per process (get_client()), shared by every
+SupabaseManager, so scrapers and scripts reuse its connections instead of
+each opening their own.
 """
 import os
+import json
+import hashlib
 import logging
-from datetime import date
-from typing import Dict, List, Any, Optional
+import threading
+from datetime import date, datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+import httpx
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from card_map_cache import CardMapCache, get_card_map_cache
+from config import (
+    UPSERT_CHUNK_SIZE, TOUCH_CHUNK_SIZE, SUPABASE_MAX_CONNECTIONS, SUPABASE_MAX_KEEPALIVE,
+    SUPABASE_TIMEOUT,
+)
+
+try:
+    from supabase.lib.client_options import SyncClientOptions
+except ImportError:  # older supabase: default client options
+    SyncClientOptions = None
 
 load_dotenv()
 
 logger = logging.getLogger("scraper.supabase")
 
+# Normalized fields a campaign's content_hash covers (not scraped_at/is_active)
+HASHED_FIELDS = (
+    'card_id', 'title', 'description', 'merchant_name', 'merchant_pattern',
+    'discount_type', 'discount_rate', 'max_discount', 'min_spend',
+    'start_date', 'end_date', 'conditions', 'source_url',
+)
+
+
+def content_hash(campaign: Dict[str, Any]) -> str:
+    """Stable hash of a normalized campaign's content."""
+    content = [campaign.get(field) for field in HASHED_FIELDS]
+    return hashlib.sha1(json.dumps(content, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Client:
+    """
+    The process-wide Supabase client, created on first use. Its PostgREST
+    requests share one keep-alive connection pool.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            url = os.getenv("SUPABASE_URL")
+            key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+            if not url or not key:
+                raise ValueError("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in .env")
+            _client = create_client(url, key, **_client_options())
+            logger.info(f"Connected to Supabase: {url}")
+        return _client
+
+
+def _client_options() -> Dict[str, Any]:
+    if SyncClientOptions is None:
+        return {}
+    # A client passed in replaces postgrest's own, so restate its timeout
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+        ),
+    )
+    try:
+        return {"options": SyncClientOptions(httpx_client=http_client)}
+    except TypeError:  # supabase without httpx_client: its default client still keeps alive
+        http_client.close()
+        return {}
+
 
 class SupabaseManager:
     """Handles all Supabase read/write operations for the scraper."""
 
-    def __init__(self):
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        if not url or not key:
-            raise ValueError("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in .env")
-        self.client: Client = create_client(url, key)
-        logger.info(f"Connected to Supabase: {url}")
+    def __init__(self, client: Optional[Client] = None, card_cache: Optional[CardMapCache] = None):
+        self.client: Client = client or get_client()
+        self.card_cache = card_cache or get_card_map_cache()
 
     def get_cards_for_bank(self, bank_slug: str) -> Dict[str, int]:
         """
         Fetch card slug -> card id mapping for a given bank.
 
+        Served from the card map cache; all banks' cards are (re)loaded in one
+        query when it is stale.
+
         Args:
             bank_slug: Bank slug (e.g., "akbank", "garanti")
 
@@ -35,67 +104,157 @@ class SupabaseManager:
             Dict mapping card slug to card id
             Example: {"akbank-axess": 1, "akbank-wings": 2}
         """
+        card_map = self.card_cache.get(bank_slug, self.get_all_card_maps)
+        if card_map is None:
+            return {}
+        logger.info(f"Found {len(card_map)} cards for bank {bank_slug}: {list(card_map.keys())}")
+        return card_map
+
+    def get_all_card_maps(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Every bank's card map in one query: {bank_slug: {card_slug: card_id}},
+        cards in id order. None if the query fails.
+        """
         try:
             response = self.client.table('cards').select(
-                'id, slug, name, bank_id, banks!inner(slug)'
-            ).eq('banks.slug', bank_slug).execute()
+                'id, slug, banks!inner(slug)'
+            ).order('id').execute()
 
-            card_map = {}
+            card_maps: Dict[str, Dict[str, int]] = {}
             for card in response.data:
-                card_map[card['slug']] = card['id']
+                card_maps.setdefault(card['banks']['slug'], {})[card['slug']] = card['id']
+            logger.info(f"Loaded cards for {len(card_maps)} banks")
+            return card_maps
+        except Exception as e:
+            logger.error(f"Failed to get cards: {e}")
+            return None
+
+    def load_bank_state(self, card_ids: List[int], page_size: int = 1000) -> Optional[Dict[Tuple[int, str], Dict[str, Any]]]:
+        """
+        Stored campaigns of a bank's cards, read once per run, in pages
+        ordered by id (without an order, pages may overlap or skip rows).
 
-            logger.info(f"Found {len(card_map)} cards for bank {bank_slug}: {list(card_map.keys())}")
-            return card_map
+        Returns:
+            {(card_id, title): {"id", "content_hash", "is_active"}}, or None
+            if they could not be read (then every campaign is written)
+        """
+        state = {}
+        try:
+            start = 0
+            while True:
+                result = self.client.table('campaigns').select(
+                    'id, card_id, title, content_hash, is_active'
+                ).in_('card_id', sorted(set(card_ids))).order('id').range(start, start + page_size - 1).execute()
+                rows = result.data or []
+                for row in rows:
+                    state[(row['card_id'], row['title'])] = row
+                if len(rows) < page_size:
+                    break
+                start += page_size
         except Exception as e:
-            logger.error(f"Failed to get cards for bank {bank_slug}: {e}")
-            return {}
+            logger.error(f"Failed to load stored campaigns for cards {card_ids}: {e}")
+            return None
+        logger.info(f"Loaded {len(state)} stored campaigns for cards {card_ids}")
+        return state
 
-    def upsert_campaigns(self, campaigns: List[Dict[str, Any]], bank_slug: str) -> int:
+    def upsert_campaigns(self, campaigns: List[Dict[str, Any]], bank_slug: str,
+                         state: Optional[Dict[Tuple[int, str], Dict[str, Any]]] = None,
+                         run_id: Optional[str] = None,
+                         chunk_size: int = UPSERT_CHUNK_SIZE) -> Dict[str, int]:
         """
-        Insert or update campaigns with deduplication.
+        Write new and changed campaigns in bulk; touch the unchanged ones.
 
         Dedup strategy: A campaign is considered duplicate if it has the same
-        card_id + title. On duplicate, we update scraped_at and any changed fields.
+        card_id + title (the unique_card_campaign constraint). A stored,
+        active campaign whose content_hash matches is unchanged: only its
+        last_seen_at (and last_run_id) is set. The rest are upserted with
+        on_conflict="card_id,title", one request per chunk; a chunk that
+        fails is split in half and retried until the failing rows are isolated.
 
         Args:
             campaigns: List of normalized campaign dicts
             bank_slug: Bank slug for logging
+            state: load_bank_state() for the campaigns' cards (loaded here if None)
+            run_id: Scrape run that saw the campaigns (see sweep_unseen_campaigns)
+            chunk_size: Campaigns per upsert request
 
         Returns:
-            Number of campaigns saved
+            {"inserted": n, "updated": n, "unchanged": n, "failed": n}
         """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
         if not campaigns:
             logger.warning(f"No campaigns to save for {bank_slug}")
-            return 0
+            return counts
 
-        saved = 0
-        for campaign in campaigns:
-            try:
-                # Check for existing campaign with same card_id + title
-                existing = self.client.table('campaigns').select('id').eq(
-                    'card_id', campaign['card_id']
-                ).eq(
-                    'title', campaign['title']
-                ).execute()
-
-                if existing.data:
-                    # Update existing campaign
-                    campaign_id = existing.data[0]['id']
-                    self.client.table('campaigns').update(campaign).eq(
-                        'id', campaign_id
-                    ).execute()
-                    logger.debug(f"Updated campaign: {campaign['title']}")
-                else:
-                    # Insert new campaign
-                    self.client.table('campaigns').insert(campaign).execute()
-                    logger.debug(f"Inserted campaign: {campaign['title']}")
-                saved += 1
+        # One row per (card_id, title): Postgres rejects an upsert that hits a row twice
+        rows = {(c['card_id'], c['title']): c for c in campaigns}
+        if len(rows) < len(campaigns):
+            logger.info(f"Merged {len(campaigns) - len(rows)} duplicate campaigns for {bank_slug}")
+        if state is None:
+            state = self.load_bank_state([card_id for card_id, _ in rows])
 
-            except Exception as e:
-                logger.error(f"Failed to save campaign '{campaign.get('title', '?')}': {e}")
+        seen = {'last_seen_at': datetime.now(timezone.utc).isoformat()}
+        if run_id:
+            seen['last_run_id'] = run_id
+        changed, unchanged_ids = [], []
+        for key, campaign in rows.items():
+            row = dict(campaign, content_hash=content_hash(campaign), **seen)
+            stored = state.get(key) if state is not None else None
+            if stored and stored.get('is_active') and stored.get('content_hash') == row['content_hash']:
+                unchanged_ids.append(stored['id'])
+            else:
+                changed.append((key, row))
+
+        chunk_size = max(1, chunk_size)
+        for start in range(0, len(changed), chunk_size):
+            self._upsert_chunk(changed[start:start + chunk_size], state, counts)
+        touch_failed = self.touch_campaigns(unchanged_ids, seen)
+        counts["unchanged"] = len(unchanged_ids) - touch_failed
+        counts["failed"] += touch_failed
 
-        logger.info(f"Saved {saved}/{len(campaigns)} campaigns for {bank_slug}")
-        return saved
+        logger.info(f"Wrote {len(changed)}/{len(rows)} campaigns for {bank_slug}: {counts}")
+        return counts
+
+    def _upsert_chunk(self, chunk: List[Tuple[Tuple[int, str], Dict[str, Any]]],
+                      state: Optional[Dict[Tuple[int, str], Dict[str, Any]]], counts: Dict[str, int]):
+        try:
+            self.client.table('campaigns').upsert(
+                [campaign for _, campaign in chunk], on_conflict='card_id,title'
+            ).execute()
+        except Exception as e:
+            if len(chunk) == 1:
+                logger.error(f"Failed to save campaign '{chunk[0][1].get('title', '?')}': {e}")
+                counts["failed"] += 1
+                return
+            # Bisect down to the bad row(s)
+            middle = len(chunk) // 2
+            self._upsert_chunk(chunk[:middle], state, counts)
+            self._upsert_chunk(chunk[middle:], state, counts)
+            return
+
+        for key, campaign in chunk:
+            # Unknown stored state counts as updated
+            if state is not None and key not in state:
+                counts["inserted"] += 1
+            else:
+                counts["updated"] += 1
+            logger.debug(f"Saved campaign: {campaign['title']}")
+
+    def touch_campaigns(self, campaign_ids: List[int], seen: Dict[str, Any],
+                        chunk_size: int = TOUCH_CHUNK_SIZE) -> int:
+        """
+        Mark unchanged campaigns as seen (last_seen_at/last_run_id), one
+        UPDATE per chunk of ids. Returns the number of ids that failed.
+        """
+        failed = 0
+        for start in range(0, len(campaign_ids), chunk_size):
+            chunk = campaign_ids[start:start + chunk_size]
+            try:
+                self.client.table('campaigns').update(seen).in_('id', chunk).execute()
+            except Exception as e:
+                logger.error(f"Failed to touch {len(chunk)} unchanged campaigns: {e}")
+                failed += len(chunk)
+        return failed
 
     def deactivate_expired_campaigns(self, card_ids: List[int]):
         """
@@ -126,6 +285,72 @@ class SupabaseManager:
         except Exception as e:
             logger.error(f"Failed to deactivate expired campaigns: {e}")
 
+    def sweep_unseen_campaigns(self, card_ids: List[int], run_id: str) -> int:
+        """
+        Mark active campaigns of these cards as inactive unless run_id saw
+        them: they are no longer on the bank's site.
+
+        Only call this after a complete run: every campaign the run found
+        must have been written or touched with run_id.
+
+        Returns:
+            Number of campaigns deactivated
+        """
+        if not card_ids:
+            return 0
+        try:
+            result = self.client.table('campaigns').update(
+                {'is_active': False}
+            ).in_(
+                'card_id', card_ids
+            ).eq(
+                'is_active', True
+            ).or_(
+                f'last_run_id.is.null,last_run_id.neq.{run_id}'
+            ).execute()
+
+            count = len(result.data) if result.data else 0
+            if count > 0:
+                logger.info(f"Deactivated {count} campaigns not seen in run {run_id}")
+            return count
+        except Exception as e:
+            logger.error(f"Failed to sweep unseen campaigns: {e}")
+            return 0
+
+    def get_active_merchant_patterns(self, page_size: int = 1000) -> List[str]:
+        """Distinct merchant_pattern values of active campaigns (paged in id order)."""
+        patterns = set()
+        try:
+            start = 0
+            while True:
+                result = self.client.table('campaigns').select('merchant_pattern').eq(
+                    'is_active', True
+                ).order('id').range(start, start + page_size - 1).execute()
+                rows = result.data or []
+                patterns.update(row['merchant_pattern'] for row in rows if row.get('merchant_pattern'))
+                if len(rows) < page_size:
+                    break
+                start += page_size
+        except Exception as e:
+            logger.error(f"Failed to get active merchant patterns: {e}")
+        return sorted(patterns)
+
+    def count_active_campaigns(self, card_ids: List[int]) -> Optional[int]:
+        """
+        Exact number of active campaigns of these cards, counted by the
+        database. None if the count query fails.
+        """
+        if not card_ids:
+            return 0
+        try:
+            result = self.client.table('campaigns').select(
+                'id', count='exact'
+            ).in_('card_id', card_ids).eq('is_active', True).limit(1).execute()
+            return result.count
+        except Exception as e:
+            logger.error(f"Failed to count active campaigns for cards {card_ids}: {e}")
+            return None
+
     def get_active_campaign_count(self) -> int:
         """Get total active campaign count for health check."""
         try:
@@ -0,0 +1,66 @@
+"""Unit tests for campaign_writer.py."""
+import asyncio
+import pytest
+from campaign_writer import CampaignWriter
+
+
+def test_writes_run_in_order_and_failures_reach_the_future():
+    async def run():
+        order = []
+
+        async def write(name):
+            order.append(name)
+            if name == "bad":
+                raise ValueError("boom")
+            return name
+
+        async with CampaignWriter(maxsize=1) as writer:
+            futures = [await writer.submit(name, lambda name=name: write(name))
+                       for name in ("a", "bad", "b")]
+            assert await futures[0] == "a"
+            with pytest.raises(ValueError):
+                await futures[1]
+            assert await futures[2] == "b"
+        assert order == ["a", "bad", "b"]
+        assert writer.stats()["banks_written"] == 2
+        assert writer.stats()["failed"] == 1
+
+    asyncio.run(run())
+
+
+def test_submit_without_running_writer_raises():
+    async def run():
+        writer = CampaignWriter()
+        with pytest.raises(RuntimeError):
+            await writer.submit("bank", asyncio.sleep)
+
+    asyncio.run(run())
+
+
+def test_cancelled_writer_fails_pending_writes_and_submit():
+    async def run():
+        writer = await CampaignWriter(maxsize=1).__aenter__()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(10)
+
+        running = await writer.submit("slow", hang)
+        queued = await writer.submit("queued", asyncio.sleep)
+        await started.wait()
+        # The queue is full: this submit waits until the writer dies
+        blocked = asyncio.ensure_future(writer.submit("blocked", asyncio.sleep))
+        await asyncio.sleep(0)
+
+        writer._task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        with pytest.raises(RuntimeError):
+            await queued
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(blocked, 1)
+        with pytest.raises(RuntimeError):
+            await writer.submit("late", asyncio.sleep)
+
+    asyncio.run(run())
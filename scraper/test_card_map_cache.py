@@ -0,0 +1,65 @@
+"""Unit tests for card_map_cache.py."""
+import json
+from card_map_cache import CardMapCache
+
+MAPS = {"akbank": {"axess": 1, "wings": 2}, "garanti": {"bonus": 3}}
+
+
+class Loader:
+    def __init__(self, maps=MAPS):
+        self.maps = maps
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return None if self.maps is None else json.loads(json.dumps(self.maps))
+
+
+def test_one_load_serves_every_bank(tmp_path):
+    cache = CardMapCache(str(tmp_path / "cards.json"))
+    load = Loader()
+    assert cache.get("akbank", load) == {"axess": 1, "wings": 2}
+    assert cache.get("garanti", load) == {"bonus": 3}
+    assert load.calls == 1
+
+
+def test_disk_copy_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "cards.json")
+    CardMapCache(path).get("akbank", Loader())
+    load = Loader()
+    assert CardMapCache(path).get("garanti", load) == {"bonus": 3}
+    assert load.calls == 0
+
+
+def test_bank_without_cards_is_cached_as_empty(tmp_path):
+    cache = CardMapCache(str(tmp_path / "cards.json"))
+    load = Loader()
+    assert cache.get("newbank", load) == {}
+    assert cache.get("newbank", load) == {}
+    assert load.calls == 1
+
+
+def test_stale_map_is_kept_when_reload_fails(tmp_path):
+    cache = CardMapCache(str(tmp_path / "cards.json"), ttl=0)
+    cache.get("akbank", Loader())
+    assert cache.get("akbank", Loader(maps=None)) == {"axess": 1, "wings": 2}
+    assert cache.get("unknownbank", Loader(maps=None)) is None
+
+
+def test_stale_cache_reloads(tmp_path):
+    cache = CardMapCache(str(tmp_path / "cards.json"), ttl=0)
+    cache.get("akbank", Loader())
+    load = Loader({"akbank": {"axess": 10}})
+    assert cache.get("akbank", load) == {"axess": 10}
+    assert load.calls == 1
+
+
+def test_invalidate_forces_reload(tmp_path):
+    path = tmp_path / "cards.json"
+    cache = CardMapCache(str(path))
+    cache.get("akbank", Loader())
+    cache.invalidate()
+    assert not path.exists()
+    load = Loader()
+    cache.get("akbank", load)
+    assert load.calls == 1
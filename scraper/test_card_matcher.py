@@ -0,0 +1,59 @@
+"""Unit tests for card_matcher.py."""
+from card_matcher import CardMatcher
+
+BANK_CONFIG = {
+    "testbank": {
+        "cards": {
+            "wings": ["wings", "wings black"],
+            "axess": ["axess"],
+            "free": ["free card"],
+        },
+        "default_card": "axess",
+    },
+    "otherbank": {
+        "cards": {"bonus": ["bonus"]},
+    },
+}
+CARD_MAP = {"wings": 1, "axess": 2, "free": 3}
+
+
+def test_turkish_casing_is_folded():
+    matcher = CardMatcher(BANK_CONFIG)
+    assert matcher.match("WİNGS kartlara özel", CARD_MAP, "testbank") == 1
+    assert matcher.match("wıngs kartlara özel", CARD_MAP, "testbank") == 1
+    assert matcher.match("WINGS kartlara özel", CARD_MAP, "testbank") == 1
+
+
+def test_most_keywords_wins():
+    matcher = CardMatcher(BANK_CONFIG)
+    assert matcher.match("Axess ve Wings Black sahiplerine", CARD_MAP, "testbank") == 1
+
+
+def test_earliest_match_breaks_ties():
+    matcher = CardMatcher(BANK_CONFIG)
+    assert matcher.match("Free Card ve Axess ile", CARD_MAP, "testbank") == 3
+    assert matcher.match("Axess ve Free Card ile", CARD_MAP, "testbank") == 2
+
+
+def test_cards_outside_the_card_map_are_ignored():
+    matcher = CardMatcher(BANK_CONFIG)
+    assert matcher.match("Bonus ve Free Card", CARD_MAP, "testbank") == 3
+
+
+def test_no_match_uses_default_card_then_first_card():
+    matcher = CardMatcher(BANK_CONFIG)
+    assert matcher.match("Tüm kartlarda", CARD_MAP, "testbank") == 2
+    assert matcher.match("Tüm kartlarda", {"bonus": 7, "bonus-gold": 8}, "otherbank") == 7
+
+
+def test_database_only_cards_match_on_slug():
+    matcher = CardMatcher(BANK_CONFIG)
+    card_map = {**CARD_MAP, "miles-smiles": 9}
+    assert matcher.match("Miles-Smiles ile mil kazan", card_map, "testbank") == 9
+
+
+def test_matches_reports_keywords_and_first_index():
+    matcher = CardMatcher(BANK_CONFIG)
+    found = matcher.matches("wings black wings")
+    assert found["wings"]["keywords"] == {"wings", "wings black"}
+    assert found["wings"]["first"] == 0
@@ -0,0 +1,111 @@
+"""Unit tests for the conditional-request logic in http_cache.py and http_fetcher.py."""
+import asyncio
+import pytest
+
+pytest.importorskip("playwright")
+httpx = pytest.importorskip("httpx")
+
+from http_cache import HttpCache, cacheable, host_matches  # noqa: E402
+from http_fetcher import HttpFetcher  # noqa: E402
+
+URL = "https://www.bank.test/kampanyalar"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_cacheable_needs_validator_and_no_no_store():
+    assert cacheable({"ETag": '"v1"'})
+    assert cacheable({"Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"})
+    assert not cacheable({"Content-Type": "text/html"})
+    assert not cacheable({"ETag": '"v1"', "Cache-Control": "private, no-store"})
+
+
+def test_host_matches_subdomains_only():
+    hosts = ("bank.test",)
+    assert host_matches("https://bank.test/a", hosts)
+    assert host_matches("https://api.bank.test/a", hosts)
+    assert not host_matches("https://notbank.test/a", hosts)
+    assert not host_matches("https://tracker.example/bank.test", hosts)
+
+
+def test_conditional_headers_after_store(cache):
+    assert cache.conditional_headers(URL) == {}
+    cache.store(URL, {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"}, b"<html>")
+    assert cache.conditional_headers(URL) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Jan 2026 00:00:00 GMT",
+    }
+
+
+def test_uncacheable_responses_are_not_stored(cache):
+    digest = cache.store(URL, {"Cache-Control": "no-store", "ETag": '"v1"'}, b"<html>")
+    assert digest
+    assert cache.lookup(URL) is None
+    cache.store(URL, {"Content-Type": "text/html"}, b"<html>")
+    assert cache.lookup(URL) is None
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache.db"), max_bytes=25)
+    cache.store("https://bank.test/a", {"ETag": "a"}, b"x" * 10)
+    cache.store("https://bank.test/b", {"ETag": "b"}, b"x" * 10)
+    cache.lookup("https://bank.test/a")
+    cache._conn.execute("UPDATE entries SET accessed_at = 0 WHERE url = 'https://bank.test/b'")
+    cache.store("https://bank.test/c", {"ETag": "c"}, b"x" * 10)
+    assert cache.lookup("https://bank.test/b") is None
+    assert cache.lookup("https://bank.test/a") is not None
+    cache.close()
+
+
+def response(status, headers=None, body=b""):
+    # A streamed body, so httpx times the response like a real one (.elapsed)
+    return httpx.Response(status, headers=headers, stream=httpx.ByteStream(body))
+
+
+def fetch_twice(cache, handler):
+    seen = []
+
+    def recording_handler(request):
+        seen.append(dict(request.headers))
+        return handler(request, len(seen))
+
+    async def run():
+        fetcher = HttpFetcher(cache=cache)
+        await fetcher.client.aclose()
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(recording_handler))
+        try:
+            return await fetcher.fetch(URL), await fetcher.fetch(URL)
+        finally:
+            await fetcher.close()
+
+    first, second = asyncio.run(run())
+    return first, second, seen
+
+
+def test_304_is_served_from_cache(cache):
+    def handler(request, n):
+        if request.headers.get("if-none-match") == '"v1"':
+            return response(304)
+        return response(200, {"ETag": '"v1"', "Content-Type": "text/html"}, "<p>Kampanyalar</p>".encode())
+
+    first, second, seen = fetch_twice(cache, handler)
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert not first["not_modified"]
+    assert second["not_modified"] and second["status"] == 200
+    assert second["html"] == "<p>Kampanyalar</p>"
+    assert second["body_hash"] == first["body_hash"]
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_without_validators_every_fetch_is_full(cache):
+    def handler(request, n):
+        return response(200, body=f"<p>{n}</p>".encode())
+
+    first, second, seen = fetch_twice(cache, handler)
+    assert "if-none-match" not in seen[1] and "if-modified-since" not in seen[1]
+    assert second["html"] == "<p>2</p>" and not second["not_modified"]
@@ -0,0 +1,59 @@
+"""Unit tests for merchant_gazetteer.py."""
+import json
+import pytest
+from merchant_gazetteer import MerchantGazetteer
+
+MERCHANTS = [
+    {"key": "trendyol", "name": "Trendyol", "aliases": ["trendyol.com"]},
+    {"key": "trendyolyemek", "name": "Trendyol Yemek", "aliases": ["trendyol go yemek"]},
+    {"key": "migros", "name": "Migros", "aliases": ["migros jet"]},
+    {"key": "ciceksepeti", "name": "Çiçeksepeti", "aliases": ["çiçek sepeti"]},
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "merchants.json"
+    path.write_text(json.dumps(MERCHANTS, ensure_ascii=False), encoding="utf-8")
+    return MerchantGazetteer(str(path))
+
+
+def key(entry):
+    return entry["key"] if entry else None
+
+
+def test_whole_words_only(gazetteer):
+    assert key(gazetteer.find("Trendyol'da %10 indirim")) == "trendyol"
+    assert key(gazetteer.find("trendyol.com alışverişlerinde")) == "trendyol"
+    assert gazetteer.find("Trendyolcu kampanyası") is None
+    assert gazetteer.find("SuperMigros") is None
+
+
+def test_turkish_suffix_without_apostrophe(gazetteer):
+    assert key(gazetteer.find("Migrosta 100 TL")) == "migros"
+    assert key(gazetteer.find("Trendyoldan alışveriş")) == "trendyol"
+
+
+def test_longest_alias_wins_at_same_start(gazetteer):
+    assert key(gazetteer.find("Trendyol Yemek siparişlerinde")) == "trendyolyemek"
+    assert key(gazetteer.find("Trendyol Go Yemek'te")) == "trendyolyemek"
+
+
+def test_earliest_match_wins(gazetteer):
+    assert key(gazetteer.find("Migros ve Trendyol'da")) == "migros"
+
+
+def test_turkish_casing_is_folded(gazetteer):
+    assert key(gazetteer.find("ÇİÇEK SEPETİ'nde")) == "ciceksepeti"
+
+
+def test_key_for_prefers_exact_alias(gazetteer):
+    assert gazetteer.key_for("Migros Jet") == "migros"
+    assert gazetteer.key_for("Trendyol Yemek") == "trendyolyemek"
+    assert gazetteer.key_for("Bilinmeyen") is None
+
+
+def test_digest_follows_content(tmp_path, gazetteer):
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps(MERCHANTS[:2]), encoding="utf-8")
+    assert MerchantGazetteer(str(path)).digest != gazetteer.digest
@@ -0,0 +1,63 @@
+"""Unit tests for merchant_index.py."""
+from merchant_index import MerchantIndex
+
+
+def test_exact_compact_match_is_canonical():
+    index = MerchantIndex(["mediamarkt", "migros"])
+    assert index.canonical("Media Markt") == "mediamarkt"
+    assert index.canonical("media-markt") == "mediamarkt"
+    assert index.stats()["merged"] == 2
+
+
+def test_unknown_pattern_becomes_canonical():
+    index = MerchantIndex(["mediamarkt"])
+    assert index.canonical("teknosa") == "teknosa"
+    assert "teknosa" in index.patterns
+    assert index.canonical("Teknosa") == "teknosa"
+
+
+def test_empty_pattern_is_returned_as_is():
+    index = MerchantIndex([])
+    assert index.canonical("") == ""
+    assert len(index) == 0
+
+
+def test_resolve_ranks_by_trigram_similarity():
+    index = MerchantIndex(["mediamarkt", "migros", "marks spencer"])
+    results = index.resolve("media mark")
+    assert results[0][0] == "mediamarkt"
+    assert results[0][1] > 0.5
+    assert all(results[i][1] >= results[i + 1][1] for i in range(len(results) - 1))
+
+
+def test_resolve_exact_scores_one():
+    index = MerchantIndex(["mediamarkt"])
+    assert index.resolve("Media Markt") == [("mediamarkt", 1.0)]
+
+
+def test_resolve_is_read_only():
+    index = MerchantIndex(["mediamarkt"])
+    index.resolve("teknosa")
+    assert index.patterns == ["mediamarkt"]
+
+
+def test_extend_does_not_merge():
+    index = MerchantIndex(["migros"])
+    index.extend(["migroz", "Migros"])
+    assert index.patterns == ["migros", "migroz"]
+
+
+def test_similar_names_are_not_merged_on_write():
+    index = MerchantIndex(["koton", "trendyol", "trendyolgo"])
+    assert index.canonical("kotonn") == "kotonn"
+    assert index.canonical("trendyol go") == "trendyolgo"
+    assert index.canonical("trendyolgo market") == "trendyolgo market"
+    assert index.stats()["merged"] == 1
+
+
+def test_gazetteer_alias_maps_to_its_key():
+    index = MerchantIndex([])
+    assert index.canonical("hepsi burada") == "hepsiburada"
+    assert index.canonical("Macrocenter") == "migros"
+    assert "migros" in index.patterns
+    assert "macrocenter" not in index.patterns
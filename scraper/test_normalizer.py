@@ -0,0 +1,59 @@
+"""Unit tests for CampaignNormalizer.normalize_batch."""
+import normalizer
+from normalizer import CampaignNormalizer
+from parse_cache import ParseCache
+
+
+def raw_campaigns(count: int, bad=()):
+    campaigns = []
+    for i in range(count):
+        raw = {
+            "card_id": i % 3 + 1,
+            "title": f"Kampanya {i}: Migros'ta %{i % 20 + 5} indirim",
+            "description": "500 TL ve üzeri harcamaya",
+            "merchant_name": "Migros",
+            "discount_text": f"%{i % 20 + 5} indirim",
+            "source_url": f"https://bank.test/kampanya/{i}",
+            "date_text": "01.02.2026 - 31.03.2026",
+        }
+        if i in bad:
+            del raw["card_id"]
+        campaigns.append(raw)
+    return campaigns
+
+
+def strip_time(campaigns):
+    return [{k: v for k, v in c.items() if k != "scraped_at"} for c in campaigns]
+
+
+def test_in_process_batch_keeps_order_and_reports_errors():
+    normalized, errors = CampaignNormalizer(ParseCache(normalizer.NORMALIZER_VERSION)).normalize_batch(
+        raw_campaigns(10, bad={4}), workers=1
+    )
+    assert [c["source_url"][-1] for c in normalized] == [str(i) for i in range(10) if i != 4]
+    assert errors == [{"index": 4, "title": "Kampanya 4: Migros'ta %9 indirim", "error": "'card_id'"}]
+
+
+def test_lazy_iterable_input():
+    normalized, errors = CampaignNormalizer().normalize_batch(iter(raw_campaigns(5)), workers=1)
+    assert len(normalized) == 5 and not errors
+
+
+def test_process_pool_matches_in_process(monkeypatch):
+    monkeypatch.setattr(normalizer, "NORMALIZE_PARALLEL_MIN", 10)
+    campaigns = raw_campaigns(45, bad={3, 31})
+    serial = CampaignNormalizer().normalize_batch(campaigns, workers=1)
+    parallel = CampaignNormalizer().normalize_batch(iter(campaigns), workers=2, chunk_size=7)
+    assert strip_time(parallel[0]) == strip_time(serial[0])
+    assert parallel[1] == serial[1]
+    assert [e["index"] for e in parallel[1]] == [3, 31]
+
+
+def test_normalized_fields():
+    normalized, _ = CampaignNormalizer().normalize_batch(raw_campaigns(1), workers=1)
+    campaign = normalized[0]
+    assert campaign["discount_type"] == "percentage"
+    assert campaign["discount_rate"] == 0.05
+    assert campaign["min_spend"] == 500.0
+    assert (campaign["start_date"], campaign["end_date"]) == ("2026-02-01", "2026-03-31")
+    assert campaign["merchant_pattern"] == "migros"
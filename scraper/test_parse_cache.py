@@ -0,0 +1,97 @@
+"""Unit tests for parse_cache.py."""
+import itertools
+import sqlite3
+import pytest
+import parse_cache
+from parse_cache import ParseCache
+
+
+class Counter:
+    def __init__(self, compute):
+        self.calls = 0
+        self.compute = compute
+
+    def __call__(self, text):
+        self.calls += 1
+        return self.compute(text)
+
+
+def test_memo_computes_once_per_namespace_and_text():
+    cache = ParseCache(1)
+    compute = Counter(str.upper)
+    assert cache.memo("a", "x", compute) == "X"
+    assert cache.memo("a", "x", compute) == "X"
+    assert cache.memo("b", "x", compute) == "X"
+    assert compute.calls == 2
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 2}
+
+
+def test_memory_tier_is_bounded_lru():
+    cache = ParseCache(1, maxsize=2)
+    compute = Counter(str.upper)
+    cache.memo("n", "a", compute)
+    cache.memo("n", "b", compute)
+    cache.memo("n", "a", compute)   # a is now most recent
+    cache.memo("n", "c", compute)   # evicts b
+    assert list(cache._lru) == [("n", "a"), ("n", "c")]
+    cache.memo("n", "b", compute)
+    assert compute.calls == 4
+
+
+def test_disk_tier_is_shared_by_instances(tmp_path):
+    path = str(tmp_path / "parse_cache.db")
+    first = ParseCache(1, path=path)
+    first.memo("dates", "01.02.2026", lambda text: ("2026-02-01", None))
+    first.close()
+
+    second = ParseCache(1, path=path)
+    compute = Counter(lambda text: None)
+    assert second.memo("dates", "01.02.2026", compute) == ("2026-02-01", None)
+    assert compute.calls == 0
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time.time() for last_used ordering."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(parse_cache.time, "time", lambda: float(next(ticks)))
+
+
+def disk_rows(path):
+    with sqlite3.connect(path) as conn:
+        return {text for (text,) in conn.execute("SELECT text FROM parsed")}
+
+
+def test_disk_tier_trims_least_recently_used(tmp_path, clock):
+    path = str(tmp_path / "parse_cache.db")
+    writer = ParseCache(1, path=path)
+    for text in ("a", "b", "c"):
+        writer.memo("n", text, str.upper)
+    writer.close()
+
+    # Reading "a" makes it recent, so "b" is now the least recently used
+    reader = ParseCache(1, path=path, max_rows=2)
+    assert reader.memo("n", "a", str.lower) == "A"
+    reader.close()
+    assert disk_rows(path) == {"a", "c"}
+
+
+def test_other_versions_are_dropped(tmp_path):
+    path = str(tmp_path / "parse_cache.db")
+    old = ParseCache(1, path=path)
+    old.memo("n", "a", lambda text: "old")
+    old.close()
+
+    new = ParseCache(2, path=path)
+    compute = Counter(lambda text: "new")
+    assert new.memo("n", "a", compute) == "new"
+    assert compute.calls == 1
+    new.close()
+
+    # Reopening with the old version drops the new rows in turn
+    again = ParseCache(1, path=path)
+    assert again.memo("n", "a", lambda text: "recomputed") == "recomputed"
+    again.close()
+
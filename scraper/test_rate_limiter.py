@@ -0,0 +1,151 @@
+"""Unit tests for rate_limiter.py: AIMD feedback, async cancellation, sync/async slots."""
+import asyncio
+import threading
+import time
+import pytest
+import rate_limiter
+from rate_limiter import HostLimiter, RateLimiter, _retry_after_seconds
+
+
+def make_limiter(**overrides) -> HostLimiter:
+    spec = {"rate": 4.0, "burst": 100, "concurrency": 1, "min_rate": 0.5,
+            "increase": 0.5, "slow_ms": 5000}
+    spec.update(overrides)
+    return HostLimiter("bank.test", **spec)
+
+
+def test_throttle_halves_rate_down_to_min_rate(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "DECREASE_COOLDOWN", 0)
+    limiter = make_limiter()
+    limiter.record(429, 0.1)
+    assert limiter.rate == 2.0
+    limiter.record(503, 0.1)
+    limiter.record(429, 0.1)
+    limiter.record(429, 0.1)
+    assert limiter.rate == 0.5
+    assert limiter.throttled == 4
+
+
+def test_decrease_cooldown_ignores_responses_already_in_flight():
+    limiter = make_limiter()
+    limiter.record(429, 0.1)
+    limiter.record(429, 0.1)
+    assert limiter.rate == 2.0
+    assert limiter.throttled == 2
+
+
+def test_slow_response_counts_as_throttle():
+    limiter = make_limiter(slow_ms=1000)
+    limiter.record(200, 1.5)
+    assert limiter.rate == 2.0
+
+
+def test_good_responses_raise_rate_back_to_max():
+    limiter = make_limiter()
+    limiter.record(429, 0.1)
+    for _ in range(10):
+        limiter.record(200, 0.1)
+    assert limiter.rate == 4.0
+
+
+def test_errors_and_failures_leave_rate_alone():
+    limiter = make_limiter()
+    limiter.rate = 2.0
+    limiter.record(500, 0.1)
+    limiter.record(None, 0.1)
+    assert limiter.rate == 2.0
+
+
+def test_retry_after_drains_the_bucket():
+    limiter = make_limiter(rate=1.0, burst=2)
+    limiter.record(429, 0.1, retry_after=3)
+    # rate halved to 0.5 req/s; the next token is ~3s away
+    assert limiter._reserve() == pytest.approx(3.0, abs=0.1)
+
+
+def test_retry_after_parsing():
+    assert _retry_after_seconds("2") == 2.0
+    assert _retry_after_seconds("Wed, 21 Oct 2026 07:28:00 GMT") is None
+    assert _retry_after_seconds(None) is None
+
+
+def test_hosts_share_limiter_without_www():
+    limiter = RateLimiter(bank_config={}, defaults={
+        "rate": 1.0, "burst": 1, "concurrency": 1, "min_rate": 0.1, "increase": 0.1, "slow_ms": 1000,
+    })
+    assert limiter.for_url("https://www.bank.test/a") is limiter.for_url("https://bank.test/b")
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    limiter = make_limiter()
+
+    async def run():
+        await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert not limiter._async_waiters
+        limiter._release()
+        await asyncio.wait_for(limiter.acquire_async(), 1)
+        assert limiter._in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_woken_then_cancelled_waiter_passes_slot_on():
+    limiter = make_limiter()
+
+    async def run():
+        await limiter.acquire_async()
+        first = asyncio.ensure_future(limiter.acquire_async())
+        second = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        # Wake the first waiter, then cancel it before it runs
+        limiter._release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, 1)
+        assert limiter._in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_sync_holder_blocks_async_acquirer_until_release():
+    limiter = make_limiter()
+    limiter.acquire()
+    released = threading.Event()
+
+    def release_later():
+        time.sleep(0.2)
+        released.set()
+        limiter._release()
+
+    async def run():
+        thread = threading.Thread(target=release_later)
+        thread.start()
+        await asyncio.wait_for(limiter.acquire_async(), 2)
+        assert released.is_set()
+        thread.join()
+
+    asyncio.run(run())
+    assert limiter._in_flight == 1
+
+
+def test_async_holder_blocks_sync_acquirer_until_release():
+    limiter = make_limiter()
+    acquired = threading.Event()
+
+    async def run():
+        await limiter.acquire_async()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        await asyncio.sleep(0.1)
+        assert not acquired.is_set()
+        limiter._release()
+        await asyncio.to_thread(thread.join, 2)
+
+    asyncio.run(run())
+    assert acquired.is_set()
@@ -97,12 +97,12 @@ def test_upsert(card_map):
     # Insert
     print(f"  Inserting: {normalized['title']}")
     saved = db.upsert_campaigns([normalized], "test")
-    print(f"  ✅ Saved {saved} campaign")
+    print(f"  ✅ Saved campaign: {saved}")
 
     # Try inserting again (should update, not duplicate)
     print(f"  Inserting again (should update)...")
     saved = db.upsert_campaigns([normalized], "test")
-    print(f"  ✅ Saved {saved} campaign (no duplicate)")
+    print(f"  ✅ Saved campaign: {saved} (should be updated, no duplicate)")
 
     # Verify
     result = db.client.table('campaigns').select('*').eq(
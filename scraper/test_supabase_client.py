@@ -0,0 +1,188 @@
+"""Offline tests for SupabaseManager's writes, against a stubbed client."""
+import types
+import pytest
+
+pytest.importorskip("supabase")
+pytest.importorskip("dotenv")
+
+from card_map_cache import CardMapCache  # noqa: E402
+from supabase_client import SupabaseManager, content_hash  # noqa: E402
+
+
+class Query:
+    """Records a PostgREST query chain; execute() asks the client for the result."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return call
+
+    def arg(self, name):
+        for call, args, kwargs in self.calls:
+            if call == name:
+                return args[0] if args else kwargs
+        return None
+
+    def execute(self):
+        self.client.executed.append(self)
+        result = self.client.handler(self)
+        if isinstance(result, types.SimpleNamespace):
+            return result
+        return types.SimpleNamespace(data=result, count=None)
+
+
+class StubClient:
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda query: [])
+        self.executed = []
+
+    def table(self, name):
+        return Query(self, name)
+
+    def ops(self, name):
+        return [q for q in self.executed if q.arg(name) is not None]
+
+
+def manager(client, tmp_path):
+    return SupabaseManager(client=client, card_cache=CardMapCache(str(tmp_path / "cards.json")))
+
+
+def campaign(card_id, title, **fields):
+    return {"card_id": card_id, "title": title, "description": "", "merchant_name": "Migros", **fields}
+
+
+def stored(row_id, c, is_active=True):
+    return {"id": row_id, "card_id": c["card_id"], "title": c["title"],
+            "content_hash": content_hash(c), "is_active": is_active}
+
+
+def test_duplicates_are_merged_on_card_and_title(tmp_path):
+    client = StubClient(lambda query: [])
+    db = manager(client, tmp_path)
+    campaigns = [campaign(1, "A", description="old"), campaign(1, "B"), campaign(1, "A", description="new"),
+                 campaign(2, "A")]
+
+    counts = db.upsert_campaigns(campaigns, "bank", state={})
+
+    upserts = client.ops("upsert")
+    assert len(upserts) == 1
+    rows = upserts[0].arg("upsert")
+    assert [(r["card_id"], r["title"]) for r in rows] == [(1, "A"), (1, "B"), (2, "A")]
+    assert rows[0]["description"] == "new"
+    assert counts == {"inserted": 3, "updated": 0, "unchanged": 0, "failed": 0}
+
+
+def test_failed_chunk_is_bisected_down_to_the_bad_row(tmp_path):
+    def handler(query):
+        rows = query.arg("upsert")
+        if rows and any(r["title"] == "bad" for r in rows):
+            raise Exception("violates check constraint")
+        return rows
+
+    client = StubClient(handler)
+    db = manager(client, tmp_path)
+    campaigns = [campaign(1, f"T{i}") for i in range(7)] + [campaign(1, "bad")]
+
+    counts = db.upsert_campaigns(campaigns, "bank", state={}, chunk_size=4)
+
+    assert counts == {"inserted": 7, "updated": 0, "unchanged": 0, "failed": 1}
+    succeeded = [q.arg("upsert") for q in client.ops("upsert")
+                 if all(r["title"] != "bad" for r in q.arg("upsert"))]
+    assert sorted(r["title"] for rows in succeeded for r in rows) == [f"T{i}" for i in range(7)]
+    # 2 chunks; the failing one is split 4 -> 2 + 2 -> 1 + 1
+    assert len(client.ops("upsert")) == 6
+
+
+def test_unchanged_rows_are_only_touched(tmp_path):
+    client = StubClient(lambda query: [])
+    db = manager(client, tmp_path)
+    same, changed, inactive = campaign(1, "Same"), campaign(1, "Changed"), campaign(1, "Inactive")
+    state = {
+        (1, "Same"): stored(10, same),
+        (1, "Changed"): stored(11, campaign(1, "Changed", description="before")),
+        (1, "Inactive"): stored(12, inactive, is_active=False),
+    }
+
+    counts = db.upsert_campaigns([same, changed, inactive, campaign(1, "New")], "bank",
+                                 state=state, run_id="run-1")
+
+    assert counts == {"inserted": 1, "updated": 2, "unchanged": 1, "failed": 0}
+    upserted = [r["title"] for r in client.ops("upsert")[0].arg("upsert")]
+    assert upserted == ["Changed", "Inactive", "New"]
+    touch = client.ops("update")[0]
+    assert touch.arg("in_") == "id"
+    assert touch.calls[-1][1] == ("id", [10])
+    assert touch.arg("update")["last_run_id"] == "run-1"
+    assert "last_seen_at" in touch.arg("update")
+
+
+def test_failed_touch_is_counted(tmp_path):
+    def handler(query):
+        if query.arg("update") is not None:
+            raise Exception("timeout")
+        return []
+
+    db = manager(StubClient(handler), tmp_path)
+    same = campaign(1, "Same")
+    counts = db.upsert_campaigns([same], "bank", state={(1, "Same"): stored(10, same)})
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 1}
+
+
+def test_unknown_state_counts_writes_as_updated(tmp_path):
+    def handler(query):
+        if query.arg("select") is not None:
+            raise Exception("read timeout")
+        return query.arg("upsert")
+
+    db = manager(StubClient(handler), tmp_path)
+    counts = db.upsert_campaigns([campaign(1, "A")], "bank")
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 0, "failed": 0}
+
+
+def test_bank_state_pages_are_ordered_by_id(tmp_path):
+    rows = [{"id": i, "card_id": 1, "title": f"T{i}", "content_hash": "h", "is_active": True}
+            for i in range(5)]
+
+    def handler(query):
+        start, end = query.arg("range"), query.calls[-1][1][1]
+        return rows[start:end + 1]
+
+    client = StubClient(handler)
+    state = manager(client, tmp_path).load_bank_state([1, 1], page_size=2)
+
+    assert sorted(row["id"] for row in state.values()) == [0, 1, 2, 3, 4]
+    assert len(client.executed) == 3
+    assert all(q.arg("order") == "id" for q in client.executed)
+
+
+def test_merchant_patterns_are_paged_in_id_order(tmp_path):
+    rows = [{"merchant_pattern": p} for p in ("migros", "", "koton", "migros")]
+
+    def handler(query):
+        start = query.arg("range")
+        return rows[start:start + 2]
+
+    client = StubClient(handler)
+    assert manager(client, tmp_path).get_active_merchant_patterns(page_size=2) == ["koton", "migros"]
+    assert all(q.arg("order") == "id" for q in client.executed)
+
+
+def test_active_count_comes_from_an_exact_count(tmp_path):
+    client = StubClient(lambda query: types.SimpleNamespace(data=[{"id": 1}], count=250))
+    assert manager(client, tmp_path).count_active_campaigns([1, 2]) == 250
+    query = client.executed[0]
+    assert query.arg("select") == "id"
+    assert query.calls[0][2] == {"count": "exact"}
+
+
+def test_failed_active_count_is_none(tmp_path):
+    def handler(query):
+        raise Exception("timeout")
+
+    assert manager(StubClient(handler), tmp_path).count_active_campaigns([1]) is None
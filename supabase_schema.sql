@@ -39,13 +39,17 @@ CREATE TABLE campaigns (
     conditions TEXT,
     source_url TEXT,
     scraped_at TIMESTAMPTZ DEFAULT NOW(),
-    is_active BOOLEAN DEFAULT TRUE
+    is_active BOOLEAN DEFAULT TRUE,
+    content_hash TEXT,
+    last_seen_at TIMESTAMPTZ DEFAULT NOW(),
+    last_run_id TEXT
 );
 
 -- İndeksler (performans için)
 CREATE INDEX idx_cards_bank_id ON cards(bank_id);
 CREATE INDEX idx_campaigns_card_id ON campaigns(card_id);
 CREATE INDEX idx_campaigns_active ON campaigns(is_active);
+CREATE INDEX idx_campaigns_card_active ON campaigns(card_id, is_active);
 CREATE INDEX idx_campaigns_merchant ON campaigns(merchant_pattern);
 
 -- Row Level Security (RLS) Politikaları